@@ -0,0 +1,85 @@
+"""
+Numeric kernels for the Learning Analytics AI Service
+
+Large batches are scored by a Numba-compiled loop when Numba is installed;
+otherwise, and for small batches, a NumPy implementation is used.
+"""
+import logging
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Grade thresholds delimiting the score buckets:
+# bucket 0 is < 60, bucket 1 is 60-69, bucket 2 is 70-79, bucket 3 is >= 80
+GRADE_THRESHOLDS = np.array([60.0, 70.0, 80.0])
+
+# Below this size the compiled kernel's dispatch overhead outweighs its
+# speedup over NumPy
+NUMBA_MIN_BATCH_SIZE = 256
+
+# SplitMix64 finalizer constants
+_MIX_C1 = np.uint64(0xBF58476D1CE4E5B5)
+_MIX_C2 = np.uint64(0x94D049BB133111EB)
+
+
+def _score_numpy(student_ids: np.ndarray, subject_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized NumPy scoring"""
+    mixed = (student_ids << np.uint64(32)) | (subject_ids & np.uint64(0xFFFFFFFF))
+    mixed = (mixed ^ (mixed >> np.uint64(30))) * _MIX_C1
+    mixed = (mixed ^ (mixed >> np.uint64(27))) * _MIX_C2
+    mixed ^= mixed >> np.uint64(31)
+    grades = 75.0 + (mixed % np.uint64(25)).astype(np.float64)
+    buckets = np.searchsorted(GRADE_THRESHOLDS, grades, side="right")
+    return grades, buckets
+
+
+if _NUMBA_AVAILABLE:
+    # Serial on purpose: the kernel is called from executor threads, and
+    # Numba's parallel threading layers are not safe to drive from several
+    # threads (the loop is memory-bound anyway)
+    @njit(cache=True, fastmath=True)
+    def _score_kernel(student_ids, subject_ids, thresholds, out_grades, out_bucket):
+        """Integer mix and threshold bucketing in a single fused loop"""
+        for i in range(student_ids.shape[0]):
+            mixed = (student_ids[i] << np.uint64(32)) | (subject_ids[i] & np.uint64(0xFFFFFFFF))
+            mixed = (mixed ^ (mixed >> np.uint64(30))) * _MIX_C1
+            mixed = (mixed ^ (mixed >> np.uint64(27))) * _MIX_C2
+            mixed ^= mixed >> np.uint64(31)
+            grade = 75.0 + np.float64(mixed % np.uint64(25))
+            # Thresholds are sorted, so the bucket is the count of those passed
+            bucket = 0
+            for t in range(thresholds.shape[0]):
+                bucket += grade >= thresholds[t]
+            out_grades[i] = grade
+            out_bucket[i] = bucket
+
+
+def score_grades(student_ids: np.ndarray, subject_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute predicted grades and threshold buckets for uint64 id arrays"""
+    n = student_ids.shape[0]
+    if not _NUMBA_AVAILABLE or n < NUMBA_MIN_BATCH_SIZE:
+        return _score_numpy(student_ids, subject_ids)
+
+    grades = np.empty(n, dtype=np.float64)
+    buckets = np.empty(n, dtype=np.int64)
+    _score_kernel(student_ids, subject_ids, GRADE_THRESHOLDS, grades, buckets)
+    return grades, buckets
+
+
+def warm_up() -> None:
+    """Compile (or load from cache) the Numba kernel before serving traffic"""
+    if not _NUMBA_AVAILABLE:
+        logger.info("Numba not available, using NumPy scoring kernels")
+        return
+
+    ids = np.ones(2, dtype=np.uint64)
+    _score_kernel(ids, ids, GRADE_THRESHOLDS, np.empty(2, dtype=np.float64), np.empty(2, dtype=np.int64))
+    logger.info("Numba scoring kernel ready")
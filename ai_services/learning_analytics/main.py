@@ -6,19 +6,32 @@ and personalized recommendations.
 """
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import numpy as np
+import orjson
+from pydantic import TypeAdapter
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
 import uvicorn
 
 from shared.config import settings
 from shared.models import (
     PredictionRequest, PredictionResponse, LearningRecommendation,
-    PerformancePrediction, ServiceHealth, ModelMetrics
+    PerformancePrediction, ServiceHealth, ModelMetrics,
+    PerformanceBatchRequest, BatchPredictionResponse,
+    LearningPatternsResponse, MetricsResponse
 )
-from shared.utils import timing_decorator, async_timing_decorator, metrics_collector
+from shared.utils import timing_decorator, async_timing_decorator, metrics_collector, timestamp_cache, ServiceState, LRUCache, close_http_session
+from shared.batcher import DynamicBatcher
+from learning_analytics.analytics_kernels import score_grades, warm_up as warm_up_kernels
 
 # Configure logging
 logging.basicConfig(level=getattr(logging, settings.log_level))
@@ -28,28 +41,28 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Learning Analytics AI Service",
     description="AI-powered learning analytics and recommendations",
-    version=settings.service_version
+    version=settings.service_version,
+    default_response_class=ORJSONResponse
 )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Add CORS middleware only for deployments that serve browsers directly
+if settings.enable_cors:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
 # Service state
-service_start_time = datetime.utcnow()
-total_predictions = 0
-active_models = 0
+service_state = ServiceState()
 
 
 @app.get("/health", response_model=ServiceHealth)
 async def health_check():
     """Health check endpoint"""
-    uptime = (datetime.utcnow() - service_start_time).total_seconds()
+    uptime = service_state.uptime_seconds
     
     return ServiceHealth(
         service_name=settings.service_name,
@@ -58,57 +71,178 @@ async def health_check():
         uptime_seconds=int(uptime),
         memory_usage_mb=0.0,  # Would be implemented with psutil
         cpu_usage_percent=0.0,  # Would be implemented with psutil
-        active_models=active_models,
-        total_predictions=total_predictions,
+        active_models=service_state.active_models,
+        total_predictions=service_state.total_predictions,
         last_prediction=None,
         errors_last_hour=0
     )
 
 
-@app.post("/predict/performance", response_model=PerformancePrediction)
+# Labels attached to each grade bucket from analytics_kernels.GRADE_THRESHOLDS
+_RISK_LABELS = [
+    ["Low predicted performance", "High risk of failure"],
+    ["Low predicted performance"],
+    [],
+    []
+]
+_RECOMMENDATION_LABELS = [
+    ["Consider additional tutoring", "Schedule parent conference", "Implement intervention plan"],
+    ["Consider additional tutoring", "Schedule parent conference"],
+    ["Consider additional tutoring"],
+    []
+]
+
+
+def _score_batch(items: List[PredictionRequest]) -> List[PerformancePrediction]:
+    """Score a batch of performance prediction requests in one vectorized pass"""
+    if not items:
+        return []
+    
+    student_ids = np.fromiter((item.student_id for item in items), dtype=np.uint64, count=len(items))
+    subject_ids = np.fromiter((item.subject_id for item in items), dtype=np.uint64, count=len(items))
+    
+    # Simulate prediction with a branchless integer mix of the two ids
+    predicted_grades, buckets = score_grades(student_ids, subject_ids)
+    confidence = 0.85
+    
+    return [
+        PerformancePrediction(
+            student_id=item.student_id,
+            subject_id=item.subject_id,
+            predicted_grade=grade,
+            confidence=confidence,
+            risk_factors=_RISK_LABELS[bucket],
+            recommendations=_RECOMMENDATION_LABELS[bucket],
+            prediction_horizon_days=30
+        )
+        for item, grade, bucket in zip(items, predicted_grades.tolist(), buckets.tolist())
+    ]
+
+
+_RECOMMENDATIONS_ADAPTER = TypeAdapter(List[LearningRecommendation])
+
+# Mock recommendations - would use actual ML model. Only student_id varies
+# between requests, so the list is serialized once with a placeholder id
+_RECOMMENDATION_TEMPLATES = [
+    LearningRecommendation(
+        student_id=0,
+        recommendation_type="study_plan",
+        title="Personalized Study Schedule",
+        description="Based on your learning patterns, we recommend studying for 2 hours daily",
+        priority=3,
+        estimated_time_minutes=120,
+        resources=[
+            {"type": "textbook", "title": "Mathematics Fundamentals", "url": "/resources/math-fundamentals"},
+            {"type": "video", "title": "Algebra Basics", "url": "/resources/algebra-basics"}
+        ],
+        reasoning="Your performance in mathematics shows improvement with consistent daily practice",
+        confidence=0.78
+    ),
+    LearningRecommendation(
+        student_id=0,
+        recommendation_type="practice_exercise",
+        title="Additional Practice Problems",
+        description="Complete 10 additional practice problems to reinforce concepts",
+        priority=2,
+        estimated_time_minutes=30,
+        resources=[
+            {"type": "exercise", "title": "Algebra Practice Set 1", "url": "/exercises/algebra-practice-1"}
+        ],
+        reasoning="You've shown strong understanding but need more practice with complex problems",
+        confidence=0.82
+    )
+]
+_RECOMMENDATIONS_JSON = _RECOMMENDATIONS_ADAPTER.dump_json(_RECOMMENDATION_TEMPLATES)
+_STUDENT_ID_MARKER = b'"student_id":0,'
+
+performance_batcher = DynamicBatcher(_score_batch, name="performance_prediction")
+
+# Predictions are deterministic in (student_id, subject_id), so serialized
+# single-item responses are kept in a small LRU cache
+PREDICTION_CACHE_SIZE = 10_000
+_prediction_cache: "LRUCache[Tuple[int, int], Tuple[bytes, float]]" = LRUCache(PREDICTION_CACHE_SIZE)
+
+
+# Model training is CPU-bound, so it runs in a separate process to keep the
+# event loop serving requests
+_train_pool = ProcessPoolExecutor(max_workers=1)
+
+# Shared across workers: predictions computed by one process are served by all
+redis_client: Optional[aioredis.Redis] = None
+
+
+async def _get_shared_prediction(key: Tuple[int, int]) -> Optional[Tuple[bytes, float]]:
+    """Look up a serialized prediction in Redis"""
+    if redis_client is None:
+        return None
+    try:
+        content = await redis_client.get("perf:%d:%d" % key)
+    except RedisError as e:
+        logger.warning(f"Prediction cache lookup failed: {e}")
+        return None
+    if content is None:
+        return None
+    return content, orjson.loads(content)["confidence"]
+
+
+async def _set_shared_prediction(key: Tuple[int, int], content: bytes) -> None:
+    """Store a serialized prediction in Redis for ``prediction_cache_ttl`` seconds"""
+    if redis_client is None:
+        return
+    try:
+        await redis_client.setex("perf:%d:%d" % key, settings.prediction_cache_ttl, content)
+    except RedisError as e:
+        logger.warning(f"Prediction cache store failed: {e}")
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Warm up scoring kernels, connect the prediction cache and start background workers"""
+    global redis_client
+    redis_client = aioredis.from_url(settings.redis_url)
+    metrics_collector.start()
+    await asyncio.get_running_loop().run_in_executor(None, warm_up_kernels)
+    performance_batcher.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers, the training pool and the prediction cache connection"""
+    global redis_client
+    await metrics_collector.stop()
+    await close_http_session()
+    await performance_batcher.stop()
+    if redis_client is not None:
+        await redis_client.close()
+        redis_client = None
+    _train_pool.shutdown(wait=False, cancel_futures=True)
+
+
+@app.post("/predict/performance", responses={200: {"model": PerformancePrediction}})
 @async_timing_decorator
 async def predict_student_performance(request: PredictionRequest):
     """Predict student performance for a given subject"""
     try:
         metrics_collector.increment_counter("performance_predictions")
         
-        # Mock prediction logic - would use actual ML model
-        student_id = request.student_id
-        subject_id = request.subject_id
-        
-        if not student_id or not subject_id:
+        if not request.student_id or not request.subject_id:
             raise HTTPException(status_code=400, detail="student_id and subject_id are required")
         
-        # Simulate prediction
-        predicted_grade = 75.0 + (hash(f"{student_id}{subject_id}") % 25)
-        confidence = 0.85
-        
-        risk_factors = []
-        if predicted_grade < 70:
-            risk_factors.append("Low predicted performance")
-        if predicted_grade < 60:
-            risk_factors.append("High risk of failure")
-        
-        recommendations = []
-        if predicted_grade < 80:
-            recommendations.append("Consider additional tutoring")
-        if predicted_grade < 70:
-            recommendations.append("Schedule parent conference")
-        if predicted_grade < 60:
-            recommendations.append("Implement intervention plan")
-        
-        prediction = PerformancePrediction(
-            student_id=student_id,
-            subject_id=subject_id,
-            predicted_grade=predicted_grade,
-            confidence=confidence,
-            risk_factors=risk_factors,
-            recommendations=recommendations,
-            prediction_horizon_days=30
-        )
+        key = (request.student_id, request.subject_id)
+        entry = _prediction_cache.get(key)
+        if entry is None:
+            entry = await _get_shared_prediction(key)
+            if entry is None:
+                # Mock prediction logic - would use actual ML model
+                prediction = await performance_batcher.submit(request)
+                entry = (prediction.model_dump_json().encode(), prediction.confidence)
+                await _set_shared_prediction(key, entry[0])
+            _prediction_cache[key] = entry
         
+        content, confidence = entry
         metrics_collector.record_metric("prediction_confidence", confidence)
-        return prediction
+        service_state.record_predictions()
+        return Response(content=content, media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error in performance prediction: {e}")
@@ -116,7 +250,69 @@ async def predict_student_performance(request: PredictionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/recommendations/learning", response_model=List[LearningRecommendation])
+@app.post("/predict/performance/batch", response_model=BatchPredictionResponse)
+@async_timing_decorator
+async def predict_student_performance_batch(request: PerformanceBatchRequest):
+    """Predict student performance for a batch of student/subject pairs.
+
+    Entries without a valid student_id and subject_id are rejected with a 422
+    naming their index, before anything is scored.
+    """
+    try:
+        metrics_collector.increment_counter("batch_performance_predictions")
+        start_time = time.time()
+        batch_id = request.batch_id or str(uuid.uuid4())
+        model_version = request.model_version or settings.service_version
+        
+        items = [
+            PredictionRequest(
+                student_id=data.student_id,
+                subject_id=data.subject_id,
+                input_data=data.model_dump(),
+                prediction_type=request.prediction_type
+            )
+            for data in request.input_data
+        ]
+        
+        # Score the whole batch in a single worker-thread hop
+        scored = await asyncio.get_running_loop().run_in_executor(None, _score_batch, items)
+        
+        created_at = datetime.utcnow()
+        predictions = [
+            PredictionResponse(
+                prediction_id=f"{batch_id}-{i}",
+                prediction_type=request.prediction_type,
+                model_version=model_version,
+                confidence=prediction.confidence,
+                prediction=prediction.model_dump(),
+                created_at=created_at
+            )
+            for i, prediction in enumerate(scored)
+        ]
+        
+        for prediction in scored:
+            metrics_collector.record_metric("prediction_confidence", prediction.confidence)
+        service_state.record_predictions(len(scored))
+        
+        return BatchPredictionResponse(
+            batch_id=batch_id,
+            prediction_type=request.prediction_type,
+            model_version=model_version,
+            total_predictions=len(items),
+            successful_predictions=len(predictions),
+            failed_predictions=len(items) - len(predictions),
+            predictions=predictions,
+            processing_time_seconds=time.time() - start_time,
+            created_at=created_at
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in batch performance prediction: {e}")
+        metrics_collector.increment_counter("prediction_errors")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/recommendations/learning", responses={200: {"model": List[LearningRecommendation]}})
 @async_timing_decorator
 async def get_learning_recommendations(request: PredictionRequest):
     """Get personalized learning recommendations for a student"""
@@ -127,38 +323,9 @@ async def get_learning_recommendations(request: PredictionRequest):
         if not student_id:
             raise HTTPException(status_code=400, detail="student_id is required")
         
-        # Mock recommendations - would use actual ML model
-        recommendations = [
-            LearningRecommendation(
-                student_id=student_id,
-                recommendation_type="study_plan",
-                title="Personalized Study Schedule",
-                description="Based on your learning patterns, we recommend studying for 2 hours daily",
-                priority=3,
-                estimated_time_minutes=120,
-                resources=[
-                    {"type": "textbook", "title": "Mathematics Fundamentals", "url": "/resources/math-fundamentals"},
-                    {"type": "video", "title": "Algebra Basics", "url": "/resources/algebra-basics"}
-                ],
-                reasoning="Your performance in mathematics shows improvement with consistent daily practice",
-                confidence=0.78
-            ),
-            LearningRecommendation(
-                student_id=student_id,
-                recommendation_type="practice_exercise",
-                title="Additional Practice Problems",
-                description="Complete 10 additional practice problems to reinforce concepts",
-                priority=2,
-                estimated_time_minutes=30,
-                resources=[
-                    {"type": "exercise", "title": "Algebra Practice Set 1", "url": "/exercises/algebra-practice-1"}
-                ],
-                reasoning="You've shown strong understanding but need more practice with complex problems",
-                confidence=0.82
-            )
-        ]
-        
-        return recommendations
+        # Patch the requested student into the pre-serialized template
+        content = _RECOMMENDATIONS_JSON.replace(_STUDENT_ID_MARKER, b'"student_id":%d,' % student_id)
+        return Response(content=content, media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error in learning recommendations: {e}")
@@ -166,7 +333,7 @@ async def get_learning_recommendations(request: PredictionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/analyze/patterns", response_model=Dict[str, Any])
+@app.post("/analyze/patterns", response_model=LearningPatternsResponse)
 @async_timing_decorator
 async def analyze_learning_patterns(request: PredictionRequest):
     """Analyze learning patterns and provide insights"""
@@ -178,22 +345,22 @@ async def analyze_learning_patterns(request: PredictionRequest):
             raise HTTPException(status_code=400, detail="student_id is required")
         
         # Mock pattern analysis - would use actual ML model
-        patterns = {
-            "learning_style": "visual",
-            "peak_performance_time": "morning",
-            "attention_span_minutes": 45,
-            "preferred_subjects": ["mathematics", "science"],
-            "challenging_subjects": ["language_arts"],
-            "study_effectiveness_score": 0.75,
-            "consistency_score": 0.68,
-            "improvement_trend": "positive",
-            "recommendations": [
+        patterns = LearningPatternsResponse(
+            learning_style="visual",
+            peak_performance_time="morning",
+            attention_span_minutes=45,
+            preferred_subjects=["mathematics", "science"],
+            challenging_subjects=["language_arts"],
+            study_effectiveness_score=0.75,
+            consistency_score=0.68,
+            improvement_trend="positive",
+            recommendations=[
                 "Use visual aids and diagrams for better understanding",
                 "Schedule difficult subjects during morning hours",
                 "Take 5-minute breaks every 45 minutes",
                 "Focus on building vocabulary for language arts"
             ]
-        }
+        )
         
         return patterns
         
@@ -203,7 +370,7 @@ async def analyze_learning_patterns(request: PredictionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/metrics", response_model=Dict[str, Any])
+@app.get("/metrics", response_model=MetricsResponse)
 async def get_service_metrics():
     """Get service metrics and statistics"""
     return metrics_collector.get_all_metrics()
@@ -223,13 +390,18 @@ async def train_model(background_tasks: BackgroundTasks, model_type: str = "perf
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _train_model_sync(model_type: str) -> None:
+    """Train a model in the training pool process"""
+    # Simulate training process
+    time.sleep(10)  # Simulate training time
+
+
 async def train_model_background(model_type: str):
     """Background task for model training"""
     try:
         logger.info(f"Starting training for model type: {model_type}")
         
-        # Simulate training process
-        await asyncio.sleep(10)  # Simulate training time
+        await asyncio.get_running_loop().run_in_executor(_train_pool, _train_model_sync, model_type)
         
         logger.info(f"Training completed for model type: {model_type}")
         metrics_collector.increment_counter("models_trained")
@@ -244,6 +416,10 @@ if __name__ == "__main__":
         "main:app",
         host=settings.api_host,
         port=settings.api_port,
+        loop="uvloop",
+        http="httptools",
+        # Auto-reload only works with a single worker, so it is dev-only
+        workers=1 if settings.debug else settings.api_workers,
         reload=settings.debug
     )
 
@@ -0,0 +1,148 @@
+"""
+Language identification kernels for the NLP AI Service
+
+Each language is profiled as smoothed log-probabilities over hashed UTF-8
+byte trigrams, built once at import from a small built-in sample. Texts are
+encoded once and their 3-byte windows scored against every profile by a
+Numba-compiled loop when Numba is installed; otherwise, and for small
+batches, a NumPy gather is used.
+"""
+import logging
+from typing import List, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Tiny training set - would be replaced by profiles from a real corpus
+_TRAINING_SAMPLES = {
+    "en": (
+        "the students will attend the mathematics class every morning and the teacher "
+        "gives them homework about what they have learned. parents can see the grades "
+        "and the attendance of their children through the school platform. this week "
+        "we are going to prepare for the exams with the whole class."
+    ),
+    "fr": (
+        "les élèves assistent au cours de mathématiques chaque matin et le professeur "
+        "leur donne des devoirs sur ce qu'ils ont appris. les parents peuvent consulter "
+        "les notes et la présence de leurs enfants sur la plateforme de l'école. cette "
+        "semaine nous allons préparer les examens avec toute la classe."
+    ),
+    "es": (
+        "los estudiantes asisten a la clase de matemáticas cada mañana y el profesor "
+        "les da tareas sobre lo que han aprendido. los padres pueden ver las notas y "
+        "la asistencia de sus hijos en la plataforma de la escuela. esta semana vamos "
+        "a preparar los exámenes con toda la clase."
+    ),
+    "de": (
+        "die schüler besuchen jeden morgen den mathematikunterricht und der lehrer gibt "
+        "ihnen hausaufgaben über das, was sie gelernt haben. die eltern können die noten "
+        "und die anwesenheit ihrer kinder auf der schulplattform sehen. diese woche "
+        "bereiten wir uns mit der ganzen klasse auf die prüfungen vor."
+    ),
+}
+
+LANGUAGES = tuple(_TRAINING_SAMPLES)
+
+# Trigrams are hashed into 2**TRIGRAM_BITS buckets
+TRIGRAM_BITS = 14
+_TRIGRAM_SHIFT = np.uint32(32 - TRIGRAM_BITS)
+_TRIGRAM_HASH = np.uint32(2654435761)
+
+# Additive smoothing for trigrams unseen in a language's sample
+_SMOOTHING = 0.5
+
+# Below this many bytes per batch the compiled kernel's dispatch overhead
+# outweighs its speedup over NumPy
+NUMBA_MIN_BATCH_BYTES = 16384
+
+
+def _encode(text: str) -> np.ndarray:
+    """Lowercase, pad with word boundaries and view as UTF-8 bytes"""
+    return np.frombuffer(f" {text.lower()} ".encode("utf-8"), dtype=np.uint8)
+
+
+def _trigram_buckets(buf: np.ndarray) -> np.ndarray:
+    """Hash every 3-byte window of ``buf`` into a bucket index"""
+    b = buf.astype(np.uint32)
+    keys = (b[:-2] << np.uint32(16)) | (b[1:-1] << np.uint32(8)) | b[2:]
+    return (keys * _TRIGRAM_HASH) >> _TRIGRAM_SHIFT
+
+
+def _build_weights() -> np.ndarray:
+    """Per-bucket log-probabilities, shape (2**TRIGRAM_BITS, len(LANGUAGES))"""
+    n_buckets = 1 << TRIGRAM_BITS
+    columns = []
+    for language in LANGUAGES:
+        counts = np.bincount(_trigram_buckets(_encode(_TRAINING_SAMPLES[language])), minlength=n_buckets)
+        columns.append(np.log((counts + _SMOOTHING) / (counts.sum() + _SMOOTHING * n_buckets)))
+    return np.ascontiguousarray(np.stack(columns, axis=1))
+
+
+TRIGRAM_WEIGHTS = _build_weights()
+
+
+def _score_numpy(buffers: List[np.ndarray]) -> np.ndarray:
+    """Sum trigram log-probabilities per text with NumPy gathers"""
+    scores = np.zeros((len(buffers), len(LANGUAGES)))
+    for i, buf in enumerate(buffers):
+        if buf.shape[0] >= 3:
+            scores[i] = TRIGRAM_WEIGHTS[_trigram_buckets(buf)].sum(axis=0)
+    return scores
+
+
+if _NUMBA_AVAILABLE:
+    # Serial on purpose: the kernel is called from batcher executor threads,
+    # and Numba's parallel threading layers are not safe to drive from
+    # several threads
+    @njit(cache=True, fastmath=True)
+    def _score_kernel(data, offsets, weights, out):
+        """Hash and score the trigram windows of each text in one pass"""
+        for d in range(offsets.shape[0] - 1):
+            for i in range(offsets[d], offsets[d + 1] - 2):
+                key = (np.uint64(data[i]) << np.uint64(16)) | (np.uint64(data[i + 1]) << np.uint64(8)) | np.uint64(data[i + 2])
+                # Integer promotion differs from NumPy's uint32 wraparound, so mask explicitly
+                bucket = ((key * np.uint64(_TRIGRAM_HASH)) & np.uint64(0xFFFFFFFF)) >> np.uint64(_TRIGRAM_SHIFT)
+                for j in range(weights.shape[1]):
+                    out[d, j] += weights[bucket, j]
+
+
+def score_languages(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Detect the language of each text.
+
+    Returns the index into ``LANGUAGES`` of the most likely language and the
+    posterior probability of every language, one row per text.
+    """
+    buffers = [_encode(text) for text in texts]
+    lengths = np.fromiter((buf.shape[0] for buf in buffers), dtype=np.int64, count=len(buffers))
+
+    if not _NUMBA_AVAILABLE or lengths.sum() < NUMBA_MIN_BATCH_BYTES:
+        log_likelihoods = _score_numpy(buffers)
+    else:
+        offsets = np.zeros(len(buffers) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        log_likelihoods = np.zeros((len(buffers), len(LANGUAGES)))
+        _score_kernel(np.concatenate(buffers), offsets, TRIGRAM_WEIGHTS, log_likelihoods)
+
+    # Softmax over languages with a uniform prior
+    probabilities = np.exp(log_likelihoods - log_likelihoods.max(axis=1, keepdims=True))
+    probabilities /= probabilities.sum(axis=1, keepdims=True)
+    return probabilities.argmax(axis=1), probabilities
+
+
+def warm_up() -> None:
+    """Compile (or load from cache) the Numba kernel before serving traffic"""
+    if not _NUMBA_AVAILABLE:
+        logger.info("Numba not available, using NumPy language kernels")
+        return
+
+    data = _encode("warm up")
+    offsets = np.array([0, data.shape[0]], dtype=np.int64)
+    _score_kernel(data, offsets, TRIGRAM_WEIGHTS, np.zeros((1, len(LANGUAGES))))
+    logger.info("Numba language kernel ready")
@@ -5,18 +5,24 @@ Provides multilingual text processing, sentiment analysis, and automated content
 """
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import numpy as np
 import uvicorn
 
 from shared.config import settings
 from shared.models import (
-    PredictionRequest, PredictionResponse, ServiceHealth
+    PredictionRequest, PredictionResponse, ServiceHealth, MetricsResponse,
+    TextRequest, TranslateRequest, SummaryRequest, ReportRequest
 )
-from shared.utils import timing_decorator, async_timing_decorator, metrics_collector
+from shared.utils import timing_decorator, async_timing_decorator, metrics_collector, timestamp_cache, ServiceState, close_http_session
+from shared.batcher import DynamicBatcher
+from nlp.language_kernels import LANGUAGES, score_languages, warm_up as warm_up_kernels
 
 # Configure logging
 logging.basicConfig(level=getattr(logging, settings.log_level))
@@ -26,28 +32,64 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="NLP AI Service",
     description="Natural Language Processing for multilingual support",
-    version=settings.service_version
+    version=settings.service_version,
+    default_response_class=ORJSONResponse
 )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+# Add CORS middleware only for deployments that serve browsers directly
+if settings.enable_cors:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+# Label order of the score vectors produced by the sentiment model
+_SENTIMENT_LABELS = ("positive", "negative", "neutral")
+
+# Mock model output - would be produced by actual NLP model
+_MOCK_SENTIMENT_SCORES = np.array([0.3, 0.1, 0.6])
+
+# Mock report template - would be produced by actual NLP model
+_REPORT_TEMPLATE = """
+        # Automated Report - {title}
+        
+        ## Summary
+        This report was generated automatically based on the provided data.
+        
+        ## Key Findings
+        - Data points analyzed: {data_points}
+        - Report generated on: {generated_on}
+        - Report type: {report_type}
+        
+        ## Recommendations
+        - Continue monitoring the data trends
+        - Consider implementing additional data collection points
+        - Review findings with relevant stakeholders
+        
+        ## Next Steps
+        - Schedule follow-up review
+        - Implement recommended changes
+        - Monitor progress and adjust as needed
+        """
+_REPORT_STATIC_WORDS = len(
+    _REPORT_TEMPLATE.format(title="", data_points="", generated_on="", report_type="").split()
 )
 
+# ASCII bytes str.split() treats as whitespace
+_WHITESPACE_BYTES = np.zeros(256, dtype=bool)
+_WHITESPACE_BYTES[list(b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f")] = True
+
 # Service state
-service_start_time = datetime.utcnow()
-total_predictions = 0
-active_models = 0
+service_state = ServiceState()
 
 
 @app.get("/health", response_model=ServiceHealth)
 async def health_check():
     """Health check endpoint"""
-    uptime = (datetime.utcnow() - service_start_time).total_seconds()
+    uptime = service_state.uptime_seconds
     
     return ServiceHealth(
         service_name="nlp-service",
@@ -56,46 +98,53 @@ async def health_check():
         uptime_seconds=int(uptime),
         memory_usage_mb=0.0,
         cpu_usage_percent=0.0,
-        active_models=active_models,
-        total_predictions=total_predictions,
+        active_models=service_state.active_models,
+        total_predictions=service_state.total_predictions,
         last_prediction=None,
         errors_last_hour=0
     )
 
 
+def _analyze_sentiment_batch(items: List[Tuple[TextRequest, bool]]) -> List[Dict[str, Any]]:
+    """Analyze sentiment for a batch of (request, verbose) items in one pass"""
+    # Mock sentiment analysis - would use actual NLP model
+    scores = np.tile(_MOCK_SENTIMENT_SCORES, (len(items), 1))
+    
+    # Determine dominant sentiment
+    dominant = scores.argmax(axis=1)
+    confidences = scores[np.arange(len(items)), dominant]
+    
+    results = []
+    for (request, verbose), row, idx, confidence in zip(items, scores, dominant.tolist(), confidences.tolist()):
+        result = {
+            "text": request.input_data.text,
+            "sentiment": _SENTIMENT_LABELS[idx],
+            "confidence": confidence,
+            "language": "en",  # Would be detected
+            "timestamp": timestamp_cache.iso
+        }
+        if verbose:
+            result["scores"] = dict(zip(_SENTIMENT_LABELS, row.tolist()))
+        results.append(result)
+    
+    return results
+
+
 @app.post("/analyze/sentiment")
 @async_timing_decorator
-async def analyze_sentiment(request: PredictionRequest):
-    """Analyze sentiment of text input"""
+async def analyze_sentiment(request: TextRequest, verbose: bool = False):
+    """Analyze sentiment of text input (pass verbose=1 for the full score distribution)"""
     try:
         metrics_collector.increment_counter("sentiment_analysis")
         
-        text = request.input_data.get("text", "")
-        if not text:
+        if not request.input_data.text:
             raise HTTPException(status_code=400, detail="text is required in input_data")
         
-        # Mock sentiment analysis - would use actual NLP model
-        sentiment_scores = {
-            "positive": 0.3,
-            "negative": 0.1,
-            "neutral": 0.6
-        }
-        
-        # Determine dominant sentiment
-        dominant_sentiment = max(sentiment_scores, key=sentiment_scores.get)
-        confidence = sentiment_scores[dominant_sentiment]
-        
-        result = {
-            "text": text,
-            "sentiment": dominant_sentiment,
-            "confidence": confidence,
-            "scores": sentiment_scores,
-            "language": "en",  # Would be detected
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        result = await sentiment_batcher.submit((request, verbose))
+        service_state.record_predictions()
         
-        metrics_collector.record_metric("sentiment_confidence", confidence)
-        return result
+        metrics_collector.record_metric("sentiment_confidence", result["confidence"])
+        return ORJSONResponse(result)
         
     except Exception as e:
         logger.error(f"Error in sentiment analysis: {e}")
@@ -103,19 +152,14 @@ async def analyze_sentiment(request: PredictionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/translate")
-@async_timing_decorator
-async def translate_text(request: PredictionRequest):
-    """Translate text between languages"""
-    try:
-        metrics_collector.increment_counter("translations")
-        
-        text = request.input_data.get("text", "")
-        target_language = request.input_data.get("target_language", "en")
-        source_language = request.input_data.get("source_language", "auto")
-        
-        if not text:
-            raise HTTPException(status_code=400, detail="text is required in input_data")
+def _translate_batch(requests: List[TranslateRequest]) -> List[Dict[str, Any]]:
+    """Translate a batch of requests in one pass"""
+    results = []
+    
+    for request in requests:
+        text = request.input_data.text
+        target_language = request.input_data.target_language
+        source_language = request.input_data.source_language
         
         # Mock translation - would use actual translation model
         translations = {
@@ -127,15 +171,30 @@ async def translate_text(request: PredictionRequest):
         
         translated_text = translations.get(target_language, text)
         
-        result = {
+        results.append({
             "original_text": text,
             "translated_text": translated_text,
             "source_language": source_language,
             "target_language": target_language,
             "confidence": 0.85,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+            "timestamp": timestamp_cache.iso
+        })
+    
+    return results
+
+
+@app.post("/translate")
+@async_timing_decorator
+async def translate_text(request: TranslateRequest):
+    """Translate text between languages"""
+    try:
+        metrics_collector.increment_counter("translations")
+        
+        if not request.input_data.text:
+            raise HTTPException(status_code=400, detail="text is required in input_data")
         
+        result = await translation_batcher.submit(request)
+        service_state.record_predictions()
         return result
         
     except Exception as e:
@@ -144,31 +203,45 @@ async def translate_text(request: PredictionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _word_spans(buf: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end byte offsets of the whitespace-separated words in ``buf``"""
+    is_word = ~_WHITESPACE_BYTES[np.frombuffer(buf, dtype=np.uint8)]
+    edges = np.flatnonzero(np.diff(is_word, prepend=False, append=False))
+    return edges[::2], edges[1::2]
+
+
 @app.post("/generate/summary")
 @async_timing_decorator
-async def generate_summary(request: PredictionRequest):
+async def generate_summary(request: SummaryRequest):
     """Generate summary of text content"""
     try:
         metrics_collector.increment_counter("summaries")
         
-        text = request.input_data.get("text", "")
-        max_length = request.input_data.get("max_length", 100)
+        text = request.input_data.text
+        max_length = request.input_data.max_length
         
         if not text:
             raise HTTPException(status_code=400, detail="text is required in input_data")
         
         # Mock summary generation - would use actual NLP model
-        words = text.split()
-        summary_length = min(max_length, len(words) // 3)
-        summary = " ".join(words[:summary_length]) + "..."
+        # Word boundaries come from one pass over the UTF-8 bytes; only the
+        # words kept in the summary are sliced out
+        buf = text.encode("utf-8")
+        starts, ends = _word_spans(buf)
+        word_count = len(starts)
+        summary_length = min(max_length, word_count // 3)
+        summary = b" ".join(
+            buf[start:end] for start, end in zip(starts[:summary_length].tolist(), ends[:summary_length].tolist())
+        ).decode("utf-8") + "..."
+        summary_words = summary_length or 1
         
         result = {
             "original_text": text,
             "summary": summary,
-            "original_length": len(words),
-            "summary_length": len(summary.split()),
-            "compression_ratio": len(summary.split()) / len(words),
-            "timestamp": datetime.utcnow().isoformat()
+            "original_length": word_count,
+            "summary_length": summary_words,
+            "compression_ratio": summary_words / word_count,
+            "timestamp": timestamp_cache.iso
         }
         
         return result
@@ -181,46 +254,36 @@ async def generate_summary(request: PredictionRequest):
 
 @app.post("/generate/report")
 @async_timing_decorator
-async def generate_report(request: PredictionRequest):
+async def generate_report(request: ReportRequest):
     """Generate automated report from data"""
     try:
         metrics_collector.increment_counter("reports")
         
-        data = request.input_data.get("data", {})
-        report_type = request.input_data.get("report_type", "general")
+        data = request.input_data.data
+        report_type = request.input_data.report_type
         
         if not data:
             raise HTTPException(status_code=400, detail="data is required in input_data")
         
         # Mock report generation - would use actual NLP model
-        report = f"""
-        # Automated Report - {report_type.title()}
-        
-        ## Summary
-        This report was generated automatically based on the provided data.
-        
-        ## Key Findings
-        - Data points analyzed: {len(data)}
-        - Report generated on: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}
-        - Report type: {report_type}
-        
-        ## Recommendations
-        - Continue monitoring the data trends
-        - Consider implementing additional data collection points
-        - Review findings with relevant stakeholders
-        
-        ## Next Steps
-        - Schedule follow-up review
-        - Implement recommended changes
-        - Monitor progress and adjust as needed
-        """
+        title = report_type.title()
+        report = _REPORT_TEMPLATE.format(
+            title=title,
+            data_points=len(data),
+            generated_on=timestamp_cache.iso[:19].replace("T", " "),
+            report_type=report_type
+        )
+        
+        # Static words are counted once at import; the date/time stamp adds two
+        # more and the data point count one
+        word_count = _REPORT_STATIC_WORDS + len(title.split()) + len(report_type.split()) + 3
         
         result = {
             "report": report,
             "report_type": report_type,
             "data_points": len(data),
-            "word_count": len(report.split()),
-            "timestamp": datetime.utcnow().isoformat()
+            "word_count": word_count,
+            "timestamp": timestamp_cache.iso
         }
         
         return result
@@ -231,38 +294,40 @@ async def generate_report(request: PredictionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _detect_language_batch(items: List[Tuple[TextRequest, bool]]) -> List[Dict[str, Any]]:
+    """Detect language for a batch of (request, verbose) items in one pass"""
+    texts = [request.input_data.text for request, _ in items]
+    detected, scores = score_languages(texts)
+    confidences = scores[np.arange(len(items)), detected]
+    
+    results = []
+    for (request, verbose), text, row, idx, confidence in zip(items, texts, scores, detected.tolist(), confidences.tolist()):
+        result = {
+            "text": text,
+            "detected_language": LANGUAGES[idx],
+            "confidence": confidence,
+            "timestamp": timestamp_cache.iso
+        }
+        if verbose:
+            result["all_scores"] = dict(zip(LANGUAGES, row.tolist()))
+        results.append(result)
+    
+    return results
+
+
 @app.post("/detect/language")
 @async_timing_decorator
-async def detect_language(request: PredictionRequest):
-    """Detect language of text input"""
+async def detect_language(request: TextRequest, verbose: bool = False):
+    """Detect language of text input (pass verbose=1 for the full score distribution)"""
     try:
         metrics_collector.increment_counter("language_detection")
         
-        text = request.input_data.get("text", "")
-        if not text:
+        if not request.input_data.text:
             raise HTTPException(status_code=400, detail="text is required in input_data")
         
-        # Mock language detection - would use actual NLP model
-        language_scores = {
-            "en": 0.8,
-            "fr": 0.1,
-            "es": 0.05,
-            "de": 0.03,
-            "other": 0.02
-        }
-        
-        detected_language = max(language_scores, key=language_scores.get)
-        confidence = language_scores[detected_language]
-        
-        result = {
-            "text": text,
-            "detected_language": detected_language,
-            "confidence": confidence,
-            "all_scores": language_scores,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        return result
+        result = await language_batcher.submit((request, verbose))
+        service_state.record_predictions()
+        return ORJSONResponse(result)
         
     except Exception as e:
         logger.error(f"Error in language detection: {e}")
@@ -270,7 +335,32 @@ async def detect_language(request: PredictionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/metrics", response_model=Dict[str, Any])
+sentiment_batcher = DynamicBatcher(_analyze_sentiment_batch, name="sentiment_analysis")
+translation_batcher = DynamicBatcher(_translate_batch, name="translation")
+language_batcher = DynamicBatcher(_detect_language_batch, name="language_detection")
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Warm up language kernels, start the metrics flush and micro-batching workers"""
+    metrics_collector.start()
+    await asyncio.get_running_loop().run_in_executor(None, warm_up_kernels)
+    sentiment_batcher.start()
+    translation_batcher.start()
+    language_batcher.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the metrics flush and micro-batching workers"""
+    await metrics_collector.stop()
+    await close_http_session()
+    await sentiment_batcher.stop()
+    await translation_batcher.stop()
+    await language_batcher.stop()
+
+
+@app.get("/metrics", response_model=MetricsResponse)
 async def get_service_metrics():
     """Get service metrics and statistics"""
     return metrics_collector.get_all_metrics()
@@ -281,6 +371,10 @@ if __name__ == "__main__":
         "main:app",
         host=settings.api_host,
         port=settings.api_port + 1,  # Different port for NLP service
+        loop="uvloop",
+        http="httptools",
+        # Auto-reload only works with a single worker, so it is dev-only
+        workers=1 if settings.debug else settings.api_workers,
         reload=settings.debug
     )
 
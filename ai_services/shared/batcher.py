@@ -0,0 +1,128 @@
+"""
+Dynamic micro-batching for AI service endpoints
+"""
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional
+
+from .config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class DynamicBatcher:
+    """Coalesce concurrent single-item requests into one batched call.
+
+    Items submitted while a batch is being collected are queued together and
+    handed to ``batch_fn`` as a list once ``max_batch_size`` items are waiting
+    or ``batch_timeout_ms`` has elapsed since the first item arrived.
+    ``batch_fn`` must return one result per item, in the same order; it runs
+    in the default thread pool so CPU work never blocks the event loop.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: Optional[int] = None,
+        batch_timeout_ms: Optional[int] = None,
+        name: Optional[str] = None
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size or settings.max_batch_size
+        self.batch_timeout = (batch_timeout_ms or settings.batch_timeout_ms) / 1000.0
+        self.name = name or batch_fn.__name__
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Items taken off the queue for the batch being collected or scored
+        self._batch: list = []
+
+    def start(self) -> None:
+        """Start the background batching worker"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+            logger.info(f"Batcher {self.name} started (max_batch_size={self.max_batch_size})")
+
+    async def stop(self) -> None:
+        """Stop the background batching worker, failing any unscored items"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+            # Never leave a caller waiting on an item the worker will not score
+            pending = self._batch
+            self._batch = []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(RuntimeError(f"Batcher {self.name} stopped"))
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result from the next batch"""
+        if self._worker is None or self._worker.done():
+            self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self) -> list:
+        """Wait for one item, then drain more until the batch is full or times out"""
+        batch = self._batch
+        batch.append(await self._queue.get())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_timeout
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        """Background loop dispatching collected batches to ``batch_fn``"""
+        while True:
+            self._batch = []
+            batch = await self._collect()
+            await self._dispatch([item for item, _ in batch], [future for _, future in batch])
+
+    async def _dispatch(self, items: list, futures: list) -> None:
+        """Score items with ``batch_fn`` and resolve their futures.
+
+        If a batch fails, its items are retried one by one so a single bad
+        item only fails its own request.
+        """
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(None, self.batch_fn, items)
+        except Exception as e:
+            if len(items) == 1:
+                if not futures[0].done():
+                    futures[0].set_exception(e)
+                return
+            logger.warning(f"Batch {self.name} failed ({len(items)} items), retrying items one by one: {e}")
+            for item, future in zip(items, futures):
+                await self._dispatch([item], [future])
+            return
+
+        results = list(results)
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+
+        # Never leave a caller waiting on a result batch_fn did not return
+        for future in futures[len(results):]:
+            if not future.done():
+                future.set_exception(RuntimeError(
+                    f"Batch {self.name} returned {len(results)} results for {len(items)} items"
+                ))
@@ -2,7 +2,7 @@
 Shared data models for AI services
 """
 from typing import List, Optional, Dict, Any, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from enum import Enum
 
@@ -35,7 +35,12 @@ class ModelType(str, Enum):
     RECOMMENDATION = "recommendation"
 
 
-class BaseAIModel(BaseModel):
+class FrozenModel(BaseModel):
+    """Base for response models, which are never mutated once built"""
+    model_config = ConfigDict(frozen=True)
+
+
+class BaseAIModel(FrozenModel):
     """Base model for AI service responses"""
     id: str
     model_type: ModelType
@@ -46,17 +51,63 @@ class BaseAIModel(BaseModel):
     status: ServiceStatus = ServiceStatus.HEALTHY
 
 
+# Ids are packed into uint64 arrays by the scoring kernels
+MAX_ID = 2**63
+
+
 class PredictionRequest(BaseModel):
     """Base prediction request model"""
-    student_id: Optional[int] = None
-    class_id: Optional[int] = None
-    subject_id: Optional[int] = None
+    student_id: Optional[int] = Field(None, ge=0, lt=MAX_ID)
+    class_id: Optional[int] = Field(None, ge=0, lt=MAX_ID)
+    subject_id: Optional[int] = Field(None, ge=0, lt=MAX_ID)
     input_data: Dict[str, Any]
     prediction_type: PredictionType
     model_version: Optional[str] = None
 
 
-class PredictionResponse(BaseModel):
+class TextInput(BaseModel):
+    """Input data for text analysis requests"""
+    text: str = ""
+
+
+class TranslateInput(TextInput):
+    """Input data for translation requests"""
+    target_language: str = "en"
+    source_language: str = "auto"
+
+
+class SummaryInput(TextInput):
+    """Input data for summary generation requests"""
+    max_length: int = 100
+
+
+class ReportInput(BaseModel):
+    """Input data for report generation requests"""
+    data: Union[Dict[str, Any], List[Any]] = Field(default_factory=dict)
+    report_type: str = "general"
+
+
+class TextRequest(PredictionRequest):
+    """Text analysis request model"""
+    input_data: TextInput
+
+
+class TranslateRequest(PredictionRequest):
+    """Translation request model"""
+    input_data: TranslateInput
+
+
+class SummaryRequest(PredictionRequest):
+    """Summary generation request model"""
+    input_data: SummaryInput
+
+
+class ReportRequest(PredictionRequest):
+    """Report generation request model"""
+    input_data: ReportInput
+
+
+class PredictionResponse(FrozenModel):
     """Base prediction response model"""
     prediction_id: str
     prediction_type: PredictionType
@@ -67,7 +118,7 @@ class PredictionResponse(BaseModel):
     created_at: datetime
 
 
-class LearningRecommendation(BaseModel):
+class LearningRecommendation(FrozenModel):
     """Learning recommendation model"""
     student_id: int
     recommendation_type: str
@@ -80,7 +131,7 @@ class LearningRecommendation(BaseModel):
     confidence: float
 
 
-class PerformancePrediction(BaseModel):
+class PerformancePrediction(FrozenModel):
     """Student performance prediction model"""
     student_id: int
     subject_id: int
@@ -91,7 +142,20 @@ class PerformancePrediction(BaseModel):
     prediction_horizon_days: int
 
 
-class AttendancePattern(BaseModel):
+class LearningPatternsResponse(FrozenModel):
+    """Learning pattern analysis model"""
+    learning_style: str
+    peak_performance_time: str
+    attention_span_minutes: int
+    preferred_subjects: List[str]
+    challenging_subjects: List[str]
+    study_effectiveness_score: float
+    consistency_score: float
+    improvement_trend: str  # "positive", "negative", "stable"
+    recommendations: List[str]
+
+
+class AttendancePattern(FrozenModel):
     """Attendance pattern analysis model"""
     student_id: int
     pattern_type: str
@@ -101,7 +165,7 @@ class AttendancePattern(BaseModel):
     trend: str  # "improving", "declining", "stable"
 
 
-class RiskAssessment(BaseModel):
+class RiskAssessment(FrozenModel):
     """Risk assessment model"""
     student_id: int
     risk_level: str  # "low", "medium", "high", "critical"
@@ -112,7 +176,7 @@ class RiskAssessment(BaseModel):
     urgency: str
 
 
-class ContentSuggestion(BaseModel):
+class ContentSuggestion(FrozenModel):
     """Content suggestion model"""
     student_id: int
     content_type: str
@@ -124,7 +188,7 @@ class ContentSuggestion(BaseModel):
     relevance_score: float
 
 
-class ModelMetrics(BaseModel):
+class ModelMetrics(FrozenModel):
     """Model performance metrics"""
     model_id: str
     accuracy: float
@@ -137,7 +201,7 @@ class ModelMetrics(BaseModel):
     last_updated: datetime
 
 
-class ServiceHealth(BaseModel):
+class ServiceHealth(FrozenModel):
     """Service health check model"""
     service_name: str
     status: ServiceStatus
@@ -151,6 +215,22 @@ class ServiceHealth(BaseModel):
     errors_last_hour: int = 0
 
 
+class MetricSummary(FrozenModel):
+    """Summary statistics for a recorded metric"""
+    count: int
+    mean: float
+    std: float
+    min: float
+    max: float
+    median: float
+
+
+class MetricsResponse(FrozenModel):
+    """Service metrics and counters"""
+    metrics: Dict[str, MetricSummary]
+    counters: Dict[str, int]
+
+
 class BatchPredictionRequest(BaseModel):
     """Batch prediction request model"""
     prediction_type: PredictionType
@@ -159,7 +239,20 @@ class BatchPredictionRequest(BaseModel):
     batch_id: Optional[str] = None
 
 
-class BatchPredictionResponse(BaseModel):
+class PerformanceBatchItem(BaseModel):
+    """One student/subject pair of a performance batch; extra keys are kept"""
+    model_config = ConfigDict(extra="allow")
+
+    student_id: int = Field(gt=0, lt=MAX_ID)
+    subject_id: int = Field(gt=0, lt=MAX_ID)
+
+
+class PerformanceBatchRequest(BatchPredictionRequest):
+    """Batch performance prediction request, validated per item"""
+    input_data: List[PerformanceBatchItem]
+
+
+class BatchPredictionResponse(FrozenModel):
     """Batch prediction response model"""
     batch_id: str
     prediction_type: PredictionType
@@ -2,16 +2,29 @@
 Shared utilities for AI services
 """
 import logging
+import sys
 import time
-import json
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import numpy as np
-import pandas as pd
-from functools import wraps
+from functools import lru_cache, wraps
+from dataclasses import dataclass
 import asyncio
-import aiohttp
+from collections import Counter, OrderedDict
+from multiprocessing import Value
+import orjson
 
+# pandas and aiohttp are slow to import and only needed by DataProcessor
+# DataFrame input and APIClient, so they are imported on first use
+if TYPE_CHECKING:
+    import aiohttp
+    import pandas as pd
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(
@@ -25,10 +38,12 @@ def timing_decorator(func):
     """Decorator to measure function execution time"""
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        if not logger.isEnabledFor(logging.INFO):
+            return func(*args, **kwargs)
+        start = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end_time = time.time()
-        logger.info(f"{func.__name__} executed in {end_time - start_time:.4f} seconds")
+        elapsed = time.perf_counter_ns() - start
+        logger.info("%s executed in %.4f seconds", func.__name__, elapsed * 1e-9)
         return result
     return wrapper
 
@@ -37,56 +52,107 @@ def async_timing_decorator(func):
     """Decorator to measure async function execution time"""
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        start_time = time.time()
+        if not logger.isEnabledFor(logging.INFO):
+            return await func(*args, **kwargs)
+        start = time.perf_counter_ns()
         result = await func(*args, **kwargs)
-        end_time = time.time()
-        logger.info(f"{func.__name__} executed in {end_time - start_time:.4f} seconds")
+        elapsed = time.perf_counter_ns() - start
+        logger.info("%s executed in %.4f seconds", func.__name__, elapsed * 1e-9)
         return result
     return wrapper
 
 
+# Below this size the compiled normalize kernel's dispatch overhead
+# outweighs its single-pass advantage over NumPy
+NORMALIZE_NUMBA_MIN_SIZE = 65536
+
+
+if _NUMBA_AVAILABLE:
+    # Serial and without fastmath: the kernel may run on several executor
+    # threads at once, and NaN inputs must give the same result as NumPy
+    @njit(cache=True)
+    def _normalize_kernel(flat, out):
+        """Min/max reduction then affine map into ``out``; returns (min, max)"""
+        data_min = flat[0]
+        data_max = flat[0]
+        for i in range(flat.shape[0]):
+            value = flat[i]
+            if value != value:
+                # NaN propagates through the reduction like ndarray.min/max
+                data_min = value
+                data_max = value
+                break
+            data_min = min(data_min, value)
+            data_max = max(data_max, value)
+        
+        if data_max != data_min:
+            scale = 1.0 / (data_max - data_min)
+            for i in range(flat.shape[0]):
+                out[i] = (flat[i] - data_min) * scale
+        return data_min, data_max
+
+
 class DataProcessor:
     """Utility class for data processing operations"""
     
     @staticmethod
-    def normalize_data(data: Union[List, np.ndarray, pd.DataFrame]) -> np.ndarray:
+    def _as_float_array(data: Union[List, np.ndarray, "pd.DataFrame"]) -> np.ndarray:
+        """Contiguous float64 view of the data, copying only when needed"""
+        # A DataFrame can only be passed in if pandas is already imported
+        pd = sys.modules.get("pandas")
+        if pd is not None and isinstance(data, pd.DataFrame):
+            return np.ascontiguousarray(data.to_numpy(dtype=np.float64, copy=False))
+        return np.ascontiguousarray(data, dtype=np.float64)
+    
+    @staticmethod
+    def normalize_data(data: Union[List, np.ndarray, "pd.DataFrame"]) -> np.ndarray:
         """Normalize data to 0-1 range"""
-        if isinstance(data, pd.DataFrame):
-            data = data.values
-        elif isinstance(data, list):
-            data = np.array(data)
+        arr = DataProcessor._as_float_array(data)
         
-        data_min = np.min(data)
-        data_max = np.max(data)
+        if _NUMBA_AVAILABLE and arr.size >= NORMALIZE_NUMBA_MIN_SIZE:
+            flat = arr.reshape(-1)
+            out = np.empty_like(flat)
+            data_min, data_max = _normalize_kernel(flat, out)
+            if data_max == data_min:
+                return np.zeros_like(arr)
+            return out.reshape(arr.shape)
+        
+        data_min = arr.min()
+        data_max = arr.max()
         
         if data_max == data_min:
-            return np.zeros_like(data)
+            return np.zeros_like(arr)
         
-        return (data - data_min) / (data_max - data_min)
+        return (arr - data_min) / (data_max - data_min)
     
     @staticmethod
-    def standardize_data(data: Union[List, np.ndarray, pd.DataFrame]) -> np.ndarray:
+    def standardize_data(data: Union[List, np.ndarray, "pd.DataFrame"]) -> np.ndarray:
         """Standardize data to mean=0, std=1"""
-        if isinstance(data, pd.DataFrame):
-            data = data.values
-        elif isinstance(data, list):
-            data = np.array(data)
+        arr = DataProcessor._as_float_array(data)
         
-        mean = np.mean(data)
-        std = np.std(data)
+        mean = arr.mean()
+        std = arr.std(ddof=0)
         
         if std == 0:
-            return np.zeros_like(data)
+            return np.zeros_like(arr)
         
-        return (data - mean) / std
+        return (arr - mean) / std
     
     @staticmethod
-    def handle_missing_values(data: pd.DataFrame, strategy: str = 'mean') -> pd.DataFrame:
+    def handle_missing_values(data: "pd.DataFrame", strategy: str = 'mean') -> "pd.DataFrame":
         """Handle missing values in DataFrame"""
-        if strategy == 'mean':
-            return data.fillna(data.mean())
-        elif strategy == 'median':
-            return data.fillna(data.median())
+        if strategy in ('mean', 'median'):
+            # Fill numeric columns one at a time through NumPy rather than
+            # aligning a Series of fill values against the whole frame
+            reducer = np.nanmean if strategy == 'mean' else np.nanmedian
+            result = data.copy()
+            for column in result.select_dtypes('number').columns:
+                values = result[column].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+                missing = np.isnan(values)
+                if missing.any() and not missing.all():
+                    np.copyto(values, reducer(values), where=missing)
+                    result[column] = values
+            return result
         elif strategy == 'mode':
             return data.fillna(data.mode().iloc[0])
         elif strategy == 'drop':
@@ -95,180 +161,415 @@ class DataProcessor:
             raise ValueError(f"Unknown strategy: {strategy}")
 
 
+class LRUCache(OrderedDict):
+    """Dict bounded to ``maxsize`` entries, evicting the least recently used.
+
+    Reads through ``[]`` or ``get`` and writes both refresh an entry's
+    recency; membership tests do not. Entries are ordered from least to most
+    recently used.
+    """
+    
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+    
+    def __setitem__(self, key, value) -> None:
+        if key in self:
+            self.move_to_end(key)
+        super().__setitem__(key, value)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+    
+    def get(self, key, default=None):
+        # OrderedDict.get bypasses __getitem__, so recency is refreshed here
+        if key in self:
+            return self[key]
+        return default
+
+
 class ModelCache:
     """Simple in-memory model cache"""
     
     def __init__(self, max_size: int = 10):
-        self.cache: Dict[str, Any] = {}
-        self.max_size = max_size
-        self.access_times: Dict[str, float] = {}
+        self.cache = LRUCache(max_size)
+    
+    @property
+    def max_size(self) -> int:
+        return self.cache.maxsize
     
     def get(self, key: str) -> Optional[Any]:
         """Get model from cache"""
-        if key in self.cache:
-            self.access_times[key] = time.time()
-            return self.cache[key]
-        return None
+        return self.cache.get(key)
     
     def put(self, key: str, value: Any) -> None:
         """Put model in cache"""
-        if len(self.cache) >= self.max_size:
-            # Remove least recently used item
-            lru_key = min(self.access_times, key=self.access_times.get)
-            del self.cache[lru_key]
-            del self.access_times[lru_key]
-        
         self.cache[key] = value
-        self.access_times[key] = time.time()
     
     def clear(self) -> None:
         """Clear cache"""
         self.cache.clear()
-        self.access_times.clear()
+
+
+class _MetricWindow:
+    """Fixed-size float64 ring buffer holding the latest samples of one metric"""
+    __slots__ = ("buf", "n", "head")
+    
+    def __init__(self, capacity: int):
+        self.buf = np.empty(capacity, dtype=np.float64)
+        self.n = 0
+        self.head = 0
+    
+    def append(self, value: float) -> None:
+        self.buf[self.head] = value
+        self.head += 1
+        if self.head == self.buf.shape[0]:
+            self.head = 0
+        if self.n < self.buf.shape[0]:
+            self.n += 1
+    
+    @property
+    def values(self) -> np.ndarray:
+        """View of the samples in the window, not in arrival order"""
+        return self.buf[:self.n]
 
 
 class MetricsCollector:
-    """Collect and store service metrics"""
+    """Collect and store service metrics
+
+    Each metric keeps its latest ``window_size`` samples, so memory stays
+    bounded in long-running services and summaries describe that window.
+    Counter increments land in a pending ``Counter`` and are merged into
+    ``counters`` by a background task every ``flush_interval`` seconds, or
+    whenever all metrics are read.
+    """
     
-    def __init__(self):
-        self.metrics: Dict[str, List[float]] = {}
+    def __init__(self, flush_interval: float = 1.0, window_size: int = 10_000):
+        self.metrics: Dict[str, _MetricWindow] = {}
+        self.window_size = window_size
         self.counters: Dict[str, int] = {}
+        self.flush_interval = flush_interval
+        self._pending: Counter = Counter()
+        self._task: Optional[asyncio.Task] = None
     
     def record_metric(self, name: str, value: float) -> None:
         """Record a metric value"""
         if name not in self.metrics:
-            self.metrics[name] = []
+            self.metrics[name] = _MetricWindow(self.window_size)
         self.metrics[name].append(value)
     
     def increment_counter(self, name: str, value: int = 1) -> None:
         """Increment a counter"""
-        if name not in self.counters:
-            self.counters[name] = 0
-        self.counters[name] += value
+        self._pending[name] += value
+    
+    def flush(self) -> None:
+        """Merge pending counter increments into ``counters``"""
+        pending, self._pending = self._pending, Counter()
+        for name, value in pending.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+    
+    def start(self) -> None:
+        """Start flushing pending counters periodically"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+    
+    async def stop(self) -> None:
+        """Stop the periodic flush and merge what is still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush()
     
     def get_metric_summary(self, name: str) -> Dict[str, float]:
         """Get summary statistics for a metric"""
-        if name not in self.metrics or not self.metrics[name]:
+        if name not in self.metrics or not self.metrics[name].n:
             return {}
         
-        values = self.metrics[name]
+        arr = self.metrics[name].values
+        n = arr.shape[0]
+        mean = arr.mean()
+        
+        # Median from an O(n) partition instead of the full sort in np.median
+        mid = n // 2
+        if n % 2:
+            median = np.partition(arr, mid)[mid]
+        else:
+            part = np.partition(arr, (mid - 1, mid))
+            median = (part[mid - 1] + part[mid]) / 2
+        
         return {
-            'count': len(values),
-            'mean': np.mean(values),
-            'std': np.std(values),
-            'min': np.min(values),
-            'max': np.max(values),
-            'median': np.median(values)
+            'count': n,
+            'mean': mean,
+            'std': np.sqrt(np.mean(np.square(arr - mean))),
+            'min': arr.min(),
+            'max': arr.max(),
+            'median': median
         }
     
     def get_all_metrics(self) -> Dict[str, Any]:
         """Get all metrics and counters"""
+        self.flush()
         return {
             'metrics': {name: self.get_metric_summary(name) for name in self.metrics},
             'counters': self.counters.copy()
         }
 
 
+class ServiceState:
+    """Health counters shared by all worker processes of a service.
+
+    Values live in shared memory, so workers forked from a preloaded app
+    (``gunicorn --preload``) report one uptime and one prediction total
+    instead of per-process values.
+    """
+    
+    def __init__(self):
+        self._start_time = Value("d", time.monotonic(), lock=False)
+        self._total_predictions = Value("q", 0)
+        self._active_models = Value("q", 0, lock=False)
+    
+    @property
+    def uptime_seconds(self) -> float:
+        """Seconds since the service was started"""
+        return time.monotonic() - self._start_time.value
+    
+    @property
+    def total_predictions(self) -> int:
+        return self._total_predictions.value
+    
+    @property
+    def active_models(self) -> int:
+        return self._active_models.value
+    
+    def record_predictions(self, count: int = 1) -> None:
+        """Add to the prediction total across all workers"""
+        with self._total_predictions.get_lock():
+            self._total_predictions.value += count
+
+
+class TimestampCache:
+    """UTC ISO-8601 timestamp with the date and time formatting memoized.
+
+    Reading ``iso`` formats the date and time only when the second changes,
+    then appends the current microseconds, so no datetime is built per call
+    and no background task is needed.
+    """
+    
+    def __init__(self):
+        self._second = -1
+        self._prefix = ""
+    
+    @property
+    def iso(self) -> str:
+        now = time.time()
+        second = int(now)
+        if second != self._second:
+            self._prefix = datetime.utcfromtimestamp(second).strftime("%Y-%m-%dT%H:%M:%S")
+            self._second = second
+        return f"{self._prefix}.{int((now - second) * 1_000_000):06d}"
+
+
+# Pooled HTTP session shared by every APIClient in the process, so repeated
+# calls reuse connections instead of redoing DNS, TCP and TLS setup
+_SESSION: Optional["aiohttp.ClientSession"] = None
+
+
+def _orjson_dumps(obj: Any) -> str:
+    """JSON encoder for request bodies (aiohttp expects a str)"""
+    return orjson.dumps(obj).decode()
+
+
+async def _get_session() -> "aiohttp.ClientSession":
+    """Return the shared HTTP session, creating it on first use"""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        import aiohttp
+        
+        # Installed with aiohttp[speedups]; enables non-blocking c-ares DNS lookups
+        try:
+            import aiodns  # noqa: F401
+            resolver = aiohttp.AsyncResolver()
+        except ImportError:
+            resolver = None
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=500, ttl_dns_cache=300, keepalive_timeout=60, resolver=resolver
+            ),
+            json_serialize=_orjson_dumps
+        )
+    return _SESSION
+
+
+async def close_http_session() -> None:
+    """Close the shared HTTP session (call on service shutdown)"""
+    global _SESSION
+    if _SESSION is not None:
+        await _SESSION.close()
+        _SESSION = None
+
+
 class APIClient:
     """HTTP client for communicating with main platform"""
     
     def __init__(self, base_url: str, timeout: int = 30):
+        import aiohttp
+        
         self.base_url = base_url
-        self.timeout = timeout
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        # Kept for existing callers; the pooled session outlives the client
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        pass
     
     async def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
         """Make GET request"""
-        if not self.session:
-            raise RuntimeError("APIClient not initialized. Use async context manager.")
-        
+        session = await _get_session()
         url = f"{self.base_url}{endpoint}"
-        async with self.session.get(url, params=params) as response:
+        async with session.get(url, params=params, timeout=self.timeout) as response:
             response.raise_for_status()
-            return await response.json()
+            return await response.json(loads=orjson.loads)
     
     async def post(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Make POST request"""
-        if not self.session:
-            raise RuntimeError("APIClient not initialized. Use async context manager.")
-        
+        session = await _get_session()
         url = f"{self.base_url}{endpoint}"
-        async with self.session.post(url, json=data) as response:
+        async with session.post(url, json=data, timeout=self.timeout) as response:
             response.raise_for_status()
-            return await response.json()
+            return await response.json(loads=orjson.loads)
     
     async def put(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Make PUT request"""
-        if not self.session:
-            raise RuntimeError("APIClient not initialized. Use async context manager.")
-        
+        session = await _get_session()
         url = f"{self.base_url}{endpoint}"
-        async with self.session.put(url, json=data) as response:
+        async with session.put(url, json=data, timeout=self.timeout) as response:
             response.raise_for_status()
-            return await response.json()
+            return await response.json(loads=orjson.loads)
     
     async def delete(self, endpoint: str) -> Dict[str, Any]:
         """Make DELETE request"""
-        if not self.session:
-            raise RuntimeError("APIClient not initialized. Use async context manager.")
-        
+        session = await _get_session()
         url = f"{self.base_url}{endpoint}"
-        async with self.session.delete(url) as response:
+        async with session.delete(url, timeout=self.timeout) as response:
             response.raise_for_status()
-            return await response.json()
+            return await response.json(loads=orjson.loads)
+    
+    async def get_many(
+        self, requests: List[Tuple[str, Optional[Dict]]], concurrency: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Make concurrent GET requests for (endpoint, params) pairs, in order"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def one(endpoint: str, params: Optional[Dict]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get(endpoint, params)
+        
+        return await asyncio.gather(*(one(endpoint, params) for endpoint, params in requests))
+    
+    async def post_many(
+        self, requests: List[Tuple[str, Dict[str, Any]]], concurrency: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Make concurrent POST requests for (endpoint, data) pairs, in order"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def one(endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.post(endpoint, data)
+        
+        return await asyncio.gather(*(one(endpoint, data) for endpoint, data in requests))
+
+
+@lru_cache(maxsize=None)
+def _make_validator(required_fields: Tuple[str, ...]) -> Callable[[Dict[str, Any]], bool]:
+    """Generate a validator with one unrolled membership check per field"""
+    src = "def validate(data):\n" + "".join(
+        f"    if {name!r} not in data:\n"
+        f"        raise ValueError({'Missing required field: ' + str(name)!r})\n"
+        for name in required_fields
+    ) + "    return True\n"
+    namespace: Dict[str, Any] = {}
+    exec(src, namespace)
+    return namespace["validate"]
 
 
 def validate_input_data(data: Dict[str, Any], required_fields: List[str]) -> bool:
     """Validate input data has required fields"""
-    for field in required_fields:
-        if field not in data:
-            raise ValueError(f"Missing required field: {field}")
-    return True
+    return _make_validator(tuple(required_fields))(data)
 
 
 def safe_json_serialize(obj: Any) -> str:
     """Safely serialize object to JSON"""
     try:
-        return json.dumps(obj, default=str)
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
     except (TypeError, ValueError) as e:
         logger.error(f"JSON serialization error: {e}")
-        return json.dumps({"error": "Serialization failed"})
+        return '{"error": "Serialization failed"}'
+
 
+if _NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _entropy_kernel(predictions):
+        """Entropy of clipped probabilities in a single pass"""
+        entropy = 0.0
+        for i in range(predictions.shape[0]):
+            p = min(max(predictions[i], 1e-10), 1.0)  # Avoid log(0)
+            entropy -= p * np.log(p)
+        return entropy
 
-def calculate_confidence_score(predictions: List[float]) -> float:
+
+def calculate_confidence_score(predictions: Union[List[float], np.ndarray]) -> float:
     """Calculate confidence score from prediction probabilities"""
-    if not predictions:
+    if len(predictions) == 0:
         return 0.0
     
+    if not (isinstance(predictions, np.ndarray) and predictions.dtype in (np.float32, np.float64)):
+        predictions = np.asarray(predictions, dtype=np.float64)
+    predictions = predictions.ravel()
+    
     # Use entropy-based confidence
-    predictions = np.array(predictions)
-    predictions = np.clip(predictions, 1e-10, 1.0)  # Avoid log(0)
-    entropy = -np.sum(predictions * np.log(predictions))
-    max_entropy = np.log(len(predictions))
+    if _NUMBA_AVAILABLE:
+        entropy = _entropy_kernel(predictions)
+    else:
+        clipped = np.clip(predictions, 1e-10, 1.0)  # Avoid log(0)
+        entropy = -np.sum(clipped * np.log(clipped))
+    max_entropy = np.log(predictions.shape[0])
     confidence = 1.0 - (entropy / max_entropy)
     
     return float(np.clip(confidence, 0.0, 1.0))
 
 
-def format_prediction_output(prediction: Any, confidence: float, metadata: Optional[Dict] = None) -> Dict[str, Any]:
+@dataclass(slots=True)
+class PredictionOutput:
+    """Prediction output for API responses (serialized natively by orjson and FastAPI)"""
+    prediction: Any
+    confidence: float
+    metadata: Dict[str, Any]
+    timestamp: str
+
+
+def format_prediction_output(prediction: Any, confidence: float, metadata: Optional[Dict] = None) -> PredictionOutput:
     """Format prediction output for API response"""
-    return {
-        "prediction": prediction,
-        "confidence": round(confidence, 4),
-        "metadata": metadata or {},
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    # timestamp_cache only formats the date and time once per second
+    return PredictionOutput(prediction, round(confidence, 4), metadata or {}, timestamp_cache.iso)
 
 
 # Global instances
 model_cache = ModelCache()
 metrics_collector = MetricsCollector()
+timestamp_cache = TimestampCache()
 
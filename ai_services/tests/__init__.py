@@ -0,0 +1 @@
+# AI services tests package
@@ -0,0 +1,119 @@
+"""
+Tests for the dynamic micro-batcher
+"""
+import asyncio
+import threading
+
+from shared.batcher import DynamicBatcher
+
+
+def run_batch(batcher: DynamicBatcher, items: list) -> list:
+    """Submit items concurrently and collect results or exceptions in order"""
+    async def main():
+        try:
+            return await asyncio.gather(*(batcher.submit(item) for item in items), return_exceptions=True)
+        finally:
+            await batcher.stop()
+    return asyncio.run(main())
+
+
+def test_concurrent_items_are_coalesced():
+    """Items submitted together are scored in one batch, results in order."""
+    calls = []
+
+    def double(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = DynamicBatcher(double, max_batch_size=8, batch_timeout_ms=50)
+    assert run_batch(batcher, [1, 2, 3, 4, 5]) == [2, 4, 6, 8, 10]
+    assert calls == [[1, 2, 3, 4, 5]]
+
+
+def test_batches_are_capped_at_max_batch_size():
+    """A full batch is dispatched without waiting for more items."""
+    calls = []
+
+    def identity(items):
+        calls.append(len(items))
+        return list(items)
+
+    batcher = DynamicBatcher(identity, max_batch_size=2, batch_timeout_ms=50)
+    assert run_batch(batcher, [1, 2, 3, 4, 5]) == [1, 2, 3, 4, 5]
+    assert calls == [2, 2, 1]
+
+
+def test_partial_batch_is_dispatched_after_timeout():
+    """A lone item is scored once the batch timeout elapses."""
+    calls = []
+
+    def identity(items):
+        calls.append(len(items))
+        return list(items)
+
+    batcher = DynamicBatcher(identity, max_batch_size=32, batch_timeout_ms=20)
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        first = await batcher.submit("a")
+        elapsed = loop.time() - start
+        second = await batcher.submit("b")
+        await batcher.stop()
+        return first, second, elapsed
+
+    first, second, elapsed = asyncio.run(main())
+    assert (first, second) == ("a", "b")
+    assert calls == [1, 1]
+    assert 0.015 <= elapsed < 1.0
+
+
+def test_failing_item_only_fails_its_own_request():
+    """When a batch raises, the other items still get their results."""
+    def checked(items):
+        if any(item < 0 for item in items):
+            raise ValueError("negative item")
+        return [item + 1 for item in items]
+
+    batcher = DynamicBatcher(checked, max_batch_size=8, batch_timeout_ms=50)
+    first, bad, last = run_batch(batcher, [1, -1, 2])
+    assert (first, last) == (2, 3)
+    assert isinstance(bad, ValueError)
+
+
+def test_missing_results_fail_instead_of_hanging():
+    """Items without a result from batch_fn get a RuntimeError."""
+    batcher = DynamicBatcher(lambda items: list(items)[:-1], max_batch_size=8, batch_timeout_ms=50)
+    *scored, missing = run_batch(batcher, [1, 2, 3])
+    assert scored == [1, 2]
+    assert isinstance(missing, RuntimeError)
+    assert "2 results for 3 items" in str(missing)
+
+
+def test_stop_fails_unscored_items():
+    """Stopping fails items being scored, collected or still queued."""
+    release = threading.Event()
+
+    def blocking(items):
+        release.wait(5)
+        return list(items)
+
+    batcher = DynamicBatcher(blocking, max_batch_size=2, batch_timeout_ms=10_000)
+
+    async def main():
+        tasks = [asyncio.create_task(batcher.submit(item)) for item in range(5)]
+        # Lets the first batch reach batch_fn while the rest stay queued
+        await asyncio.sleep(0.1)
+        await batcher.stop()
+        release.set()
+        results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 1)
+
+        collecting = asyncio.create_task(batcher.submit("late"))
+        await asyncio.sleep(0.05)
+        await batcher.stop()
+        late, = await asyncio.wait_for(asyncio.gather(collecting, return_exceptions=True), 1)
+        return results + [late]
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert "stopped" in str(results[0])
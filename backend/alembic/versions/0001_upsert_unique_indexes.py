@@ -0,0 +1,58 @@
+"""Add the unique and partial indexes introduced after the initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 00:00:00
+
+Databases created before these indexes existed only got them on fresh
+tables, as create_all never alters existing ones. The rating and group
+membership upserts use the unique indexes as their ON CONFLICT target, so
+duplicate rows are removed first: the latest rating and the earliest
+membership of each pair are kept.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "DELETE FROM resource_ratings WHERE id NOT IN "
+        "(SELECT MAX(id) FROM resource_ratings GROUP BY resource_id, user_id)"
+    )
+    op.execute(
+        "DELETE FROM message_group_members WHERE id NOT IN "
+        "(SELECT MIN(id) FROM message_group_members GROUP BY group_id, user_id)"
+    )
+    op.create_index(
+        "uq_resource_rating_user", "resource_ratings", ["resource_id", "user_id"],
+        unique=True, if_not_exists=True
+    )
+    op.create_index(
+        "uq_message_group_member", "message_group_members", ["group_id", "user_id"],
+        unique=True, if_not_exists=True
+    )
+
+    unread = sa.column("is_read") == sa.false()
+    op.create_index(
+        "ix_msgs_unread", "messages", ["recipient_id"],
+        postgresql_where=unread, sqlite_where=unread, if_not_exists=True
+    )
+    op.create_index(
+        "ix_fin_tx_type_created", "financial_transactions", ["transaction_type", "created_at"],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_fin_tx_type_created", table_name="financial_transactions", if_exists=True)
+    op.drop_index("ix_msgs_unread", table_name="messages", if_exists=True)
+    op.drop_index("uq_message_group_member", table_name="message_group_members", if_exists=True)
+    op.drop_index("uq_resource_rating_user", table_name="resource_ratings", if_exists=True)
@@ -1,64 +1,150 @@
-from datetime import datetime, timedelta
-from typing import Optional
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Optional, Tuple
 
+import bcrypt
 from fastapi import Depends, HTTPException, status
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import jwt
+from jwt import InvalidTokenError
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import UserOut
-from database import get_db
+from database import get_db, get_async_db
 
 SECRET_KEY = "supersecretkey"  # For production, load from environment variable!
 ALGORITHM = "HS256"
+# Encoded once rather than on every sign/verify
+_SIGNING_KEY = SECRET_KEY.encode()
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+_DEFAULT_EXP_SECS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+BCRYPT_ROUNDS = 12
+# bcrypt only uses the first 72 bytes; truncate like passlib did so existing hashes still verify
+BCRYPT_MAX_PASSWORD_BYTES = 72
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Verified token claims are reused for a short window to skip re-verifying
+# the signature of a token seen moments ago
+TOKEN_CACHE_SIZE = 10_000
+TOKEN_CACHE_TTL_SECONDS = 30
+_token_cache: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+@functools.cache
+def _ctx():
+    # Deferred so passlib is only set up if something still asks for it
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def __getattr__(name):
+    # Kept for code that imports pwd_context; hashing below calls bcrypt directly
+    if name == "pwd_context":
+        return _ctx()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(
+            plain_password.encode()[:BCRYPT_MAX_PASSWORD_BYTES], hashed_password.encode()
+        )
+    except ValueError:
+        # Not a bcrypt hash
+        return False
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(
+        password.encode()[:BCRYPT_MAX_PASSWORD_BYTES], bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    ).decode()
 
 def authenticate_user(email: str, password: str, db: Session = Depends(get_db)):
+    # Imported here because database_service imports this module
+    from database_service import DatabaseService
     db_service = DatabaseService(db)
     user_obj = db_service.get_user_by_email(email)
     if not user_obj or not hasattr(user_obj, "hashed_password"):
         return None
+    # Callers are sync endpoints, which FastAPI already runs in its threadpool,
+    # so the ~100ms bcrypt check and the lookup stay off the event loop
     if not verify_password(password, user_obj.hashed_password):
         return None
     return user_obj
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    # Integer epoch seconds, which is what the exp claim is encoded as anyway
+    exp = int(time.time()) + (int(expires_delta.total_seconds()) if expires_delta else _DEFAULT_EXP_SECS)
+    return jwt.encode({**data, "exp": exp}, _SIGNING_KEY, algorithm=ALGORITHM)
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def decode_access_token(token: str) -> dict:
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    now = time.time()
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is not None:
+            payload, cached_until = entry
+            if now < cached_until:
+                _token_cache.move_to_end(key)
+                return payload
+            del _token_cache[key]
+
+    payload = jwt.decode(
+        token, _SIGNING_KEY, algorithms=[ALGORITHM], options={"require": ["exp", "sub", "email"]}
+    )
+    # Never serve a token from the cache past its own expiry
+    cached_until = min(now + TOKEN_CACHE_TTL_SECONDS, payload.get("exp", now))
+    with _token_cache_lock:
+        _token_cache[key] = (payload, cached_until)
+        if len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return payload
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _token_email(token: str) -> str:
+    """Return the email of a valid access token, raising 401 otherwise"""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         user_id: int = payload.get("sub")
         email: str = payload.get("email")
         if user_id is None or email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
+            raise _credentials_exception()
+    except InvalidTokenError:
+        raise _credentials_exception()
+    return email
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    email = _token_email(token)
+    # Imported here because database_service imports this module
+    from database_service import DatabaseService
     db_service = DatabaseService(db)
     user_obj = db_service.get_user_by_email(email)
     if user_obj is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user_obj
 
 def get_current_active_user(current_user: UserOut = Depends(get_current_user)):
     return current_user
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """get_current_user for routes on AsyncDatabaseService, so they hold no sync session"""
+    email = _token_email(token)
+    from database_service import AsyncDatabaseService
+    db_service = AsyncDatabaseService(db)
+    user_obj = await db_service.get_user_by_email(email)
+    if user_obj is None:
+        raise _credentials_exception()
+    return user_obj
+
+async def get_current_active_user_async(current_user: UserOut = Depends(get_current_user_async)):
+    return current_user
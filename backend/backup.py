@@ -7,21 +7,31 @@ import os
 import shutil
 import subprocess
 import json
-import gzip
-from datetime import datetime, timedelta
-from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+import hashlib
+import signal
+import tempfile
+from collections import Counter
+from contextlib import ExitStack
+from datetime import datetime, time as dt_time, timedelta
+from typing import Any, BinaryIO, Callable, List, Dict, Optional, Tuple
 import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 
 import psycopg2
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
-import schedule
-import time
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -54,6 +64,13 @@ class BackupConfig:
     backup_dir: str = "./backups"
     retention_days: int = 30
     compression: bool = True
+    compression_codec: str = "zstd"  # "zstd", "gzip" or "none"
+    # "plain" streams a single SQL script through the compressor, so nothing
+    # uncompressed touches the disk. "directory" dumps tables in parallel but
+    # stages the whole dump (gzip-compressed per table by pg_dump) in
+    # backup_dir first, even with stream_to_s3, so it needs free space for it
+    pg_dump_format: str = "plain"
+    pg_jobs: Optional[int] = None  # Defaults to the CPU count
     encryption: bool = True
     
     # AWS S3 settings (optional)
@@ -61,6 +78,8 @@ class BackupConfig:
     s3_region: str = "us-east-1"
     aws_access_key: Optional[str] = None
     aws_secret_key: Optional[str] = None
+    # Pipe database dumps straight into S3 instead of staging them on disk
+    stream_to_s3: bool = False
     
     # File backup settings
     file_backup_paths: List[str] = None
@@ -84,6 +103,26 @@ class BackupInfo:
     file_path: str
     metadata: Dict
 
+# File suffix appended to database dumps for each compression codec
+COMPRESSION_SUFFIXES = {"zstd": ".zst", "gzip": ".gz", "none": ""}
+
+# Per-table compression pg_dump applies to directory-format dumps
+PG_DUMP_GZIP_LEVEL = 6
+
+# Backup directories already created by this process
+_ENSURED_DIRS: set = set()
+
+def _ensure_dir(path: str) -> None:
+    """Create ``path`` once per process, skipping the mkdir on later calls"""
+    key = os.path.abspath(path)
+    if key not in _ENSURED_DIRS:
+        os.makedirs(key, exist_ok=True)
+        _ENSURED_DIRS.add(key)
+
+def _forget_dir(path: str) -> None:
+    """Drop ``path`` from the cache so the next ``_ensure_dir`` recreates it"""
+    _ENSURED_DIRS.discard(os.path.abspath(path))
+
 class DatabaseBackup:
     """Handles PostgreSQL database backups"""
     
@@ -93,52 +132,69 @@ class DatabaseBackup:
     
     def ensure_backup_directory(self):
         """Create backup directory if it doesn't exist"""
-        Path(self.config.backup_dir).mkdir(parents=True, exist_ok=True)
+        _ensure_dir(self.config.backup_dir)
     
-    def create_backup(self, backup_type: BackupType = BackupType.FULL) -> BackupInfo:
-        """Create a database backup"""
+    def create_backup(
+        self,
+        backup_type: BackupType = BackupType.FULL,
+        upload: Optional[Callable[[BinaryIO, BackupType, str], Tuple[str, int]]] = None
+    ) -> BackupInfo:
+        """Create a database backup
+        
+        With ``upload``, the compressed dump is streamed to it instead of
+        written to ``backup_dir``; it returns the stored location and size.
+        ``upload`` has consumed the stream before a failed command is
+        detected, so it must stage what it stores until the backup succeeds.
+        """
         timestamp = datetime.now()
         backup_id = f"db_{backup_type.value}_{timestamp.strftime('%Y%m%d_%H%M%S')}"
         
         # Create backup file path
-        backup_file = f"{backup_id}.sql"
-        if self.config.compression:
-            backup_file += ".gz"
-        
+        codec = self._compression_codec()
+        directory_format = self.config.pg_dump_format == "directory"
+        extension = ".tar" if directory_format else ".sql"
+        # pg_dump compresses directory dumps itself, so the tar is not recompressed
+        archive_codec = "none" if directory_format else codec
+        backup_file = f"{backup_id}{extension}{COMPRESSION_SUFFIXES[archive_codec]}"
         backup_path = os.path.join(self.config.backup_dir, backup_file)
         
         try:
             logger.info(f"Starting {backup_type.value} database backup: {backup_id}")
+            self.ensure_backup_directory()
             
-            # Build pg_dump command
-            cmd = [
-                "pg_dump",
-                "-h", self.config.db_host,
-                "-p", str(self.config.db_port),
-                "-U", self.config.db_user,
-                "-d", self.config.db_name,
-                "-f", backup_path,
-                "--verbose",
-                "--no-password"
-            ]
-            
-            # Set password via environment variable
-            env = os.environ.copy()
-            env["PGPASSWORD"] = self.config.db_password
-            
-            # Execute backup
-            result = subprocess.run(cmd, env=env, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                raise Exception(f"pg_dump failed: {result.stderr}")
-            
-            # Compress if needed
-            if self.config.compression and not backup_path.endswith('.gz'):
-                self._compress_file(backup_path)
-                backup_path += ".gz"
-            
-            # Get file size
-            size_bytes = os.path.getsize(backup_path)
+            dump_dir = os.path.join(self.config.backup_dir, f"{backup_id}.pgdir")
+            try:
+                if directory_format:
+                    # Dump tables in parallel worker connections, each
+                    # compressed as it is written, then archive the dump
+                    # directory as a single stream
+                    level = "0" if codec == "none" else str(PG_DUMP_GZIP_LEVEL)
+                    _run_pipeline(
+                        [self._pg_dump_command() + ["-Fd", "-j", str(self._jobs()), "-Z", level, "-f", dump_dir]],
+                        env=self._pg_env()
+                    )
+                    commands = [["tar", "-cf", "-", "-C", self.config.backup_dir, os.path.basename(dump_dir)]]
+                else:
+                    commands = [self._pg_dump_command()]
+                if archive_codec != "none":
+                    commands.append(self._compressor_command(archive_codec))
+                
+                if upload is not None:
+                    backup_path, size_bytes = _run_pipeline(
+                        commands, subprocess.PIPE, self._pg_env(),
+                        consume=lambda stream: upload(stream, backup_type, backup_id)
+                    )
+                else:
+                    # Stream the dump straight into the final file; for the
+                    # plain format the uncompressed dump never touches the disk
+                    with open(backup_path, 'wb') as out:
+                        _run_pipeline(commands, out, self._pg_env())
+                    
+                    # Get file size
+                    size_bytes = os.path.getsize(backup_path)
+            finally:
+                if directory_format:
+                    shutil.rmtree(dump_dir, ignore_errors=True)
             
             # Create backup info
             backup_info = BackupInfo(
@@ -151,7 +207,9 @@ class DatabaseBackup:
                 metadata={
                     "database": self.config.db_name,
                     "host": self.config.db_host,
-                    "compressed": self.config.compression,
+                    "format": self.config.pg_dump_format,
+                    "compressed": codec != "none",
+                    "compression_codec": "gzip" if directory_format and codec != "none" else codec,
                     "encrypted": self.config.encryption
                 }
             )
@@ -161,13 +219,16 @@ class DatabaseBackup:
             
         except Exception as e:
             logger.error(f"Database backup failed: {e}")
+            # The directory may have been removed underneath us
+            _forget_dir(self.config.backup_dir)
             return BackupInfo(
                 backup_id=backup_id,
                 backup_type=backup_type,
                 timestamp=timestamp,
                 status=BackupStatus.FAILED,
                 size_bytes=0,
-                file_path=backup_path,
+                # A streamed dump never had a local file
+                file_path="" if upload is not None else backup_path,
                 metadata={"error": str(e)}
             )
     
@@ -180,40 +241,10 @@ class DatabaseBackup:
             if not os.path.exists(backup_path):
                 raise Exception(f"Backup file not found: {backup_path}")
             
-            # Handle compressed files
-            if backup_path.endswith('.gz'):
-                # Decompress temporarily
-                temp_path = backup_path.replace('.gz', '')
-                with gzip.open(backup_path, 'rb') as f_in:
-                    with open(temp_path, 'wb') as f_out:
-                        shutil.copyfileobj(f_in, f_out)
-                restore_path = temp_path
+            if ".tar" in os.path.basename(backup_path):
+                self._restore_archive(backup_path)
             else:
-                restore_path = backup_path
-            
-            # Build psql command
-            cmd = [
-                "psql",
-                "-h", self.config.db_host,
-                "-p", str(self.config.db_port),
-                "-U", self.config.db_user,
-                "-d", self.config.db_name,
-                "-f", restore_path
-            ]
-            
-            # Set password via environment variable
-            env = os.environ.copy()
-            env["PGPASSWORD"] = self.config.db_password
-            
-            # Execute restore
-            result = subprocess.run(cmd, env=env, capture_output=True, text=True)
-            
-            # Clean up temporary file if created
-            if restore_path != backup_path and os.path.exists(restore_path):
-                os.remove(restore_path)
-            
-            if result.returncode != 0:
-                raise Exception(f"psql restore failed: {result.stderr}")
+                self._restore_sql(backup_path)
             
             logger.info("Database restore completed successfully")
             return True
@@ -222,12 +253,213 @@ class DatabaseBackup:
             logger.error(f"Database restore failed: {e}")
             return False
     
-    def _compress_file(self, file_path: str):
-        """Compress a file using gzip"""
-        with open(file_path, 'rb') as f_in:
-            with gzip.open(f"{file_path}.gz", 'wb') as f_out:
-                shutil.copyfileobj(f_in, f_out)
-        os.remove(file_path)
+    def _restore_sql(self, backup_path: str):
+        """Replay a plain SQL dump with psql"""
+        psql_cmd = ["psql", *self._pg_connection_args()]
+        decompressor_cmd = self._decompressor_command(backup_path)
+        
+        # psql's stdout is a line per statement, so it is discarded
+        if decompressor_cmd is None:
+            _run_pipeline([psql_cmd + ["-f", backup_path]], subprocess.DEVNULL, self._pg_env())
+        else:
+            # Decompress straight into psql, so SQL runs while the rest of
+            # the dump is still being decompressed
+            _run_pipeline([decompressor_cmd, psql_cmd], subprocess.DEVNULL, self._pg_env())
+    
+    def _restore_archive(self, backup_path: str):
+        """Extract a directory-format dump and restore it with parallel pg_restore"""
+        # Extracted next to the archive so it stays on the same filesystem
+        extract_dir = tempfile.mkdtemp(prefix=".restore_", dir=self.config.backup_dir)
+        try:
+            decompressor_cmd = self._decompressor_command(backup_path)
+            if decompressor_cmd is None:
+                _run_pipeline([["tar", "-xf", backup_path, "-C", extract_dir]])
+            else:
+                _run_pipeline([decompressor_cmd, ["tar", "-xf", "-", "-C", extract_dir]])
+            
+            dump_dir = os.path.join(extract_dir, os.listdir(extract_dir)[0])
+            _run_pipeline(
+                [["pg_restore", *self._pg_connection_args(), "-Fd", "-j", str(self._jobs()), "--no-password", dump_dir]],
+                subprocess.DEVNULL, self._pg_env()
+            )
+        finally:
+            shutil.rmtree(extract_dir, ignore_errors=True)
+    
+    def _pg_connection_args(self) -> List[str]:
+        """Connection arguments shared by the PostgreSQL client tools"""
+        return [
+            "-h", self.config.db_host,
+            "-p", str(self.config.db_port),
+            "-U", self.config.db_user,
+            "-d", self.config.db_name
+        ]
+    
+    def _pg_env(self) -> Dict[str, str]:
+        """Environment for PostgreSQL client tools"""
+        # Set password via environment variable
+        env = os.environ.copy()
+        env["PGPASSWORD"] = self.config.db_password
+        return env
+    
+    def _pg_dump_command(self) -> List[str]:
+        cmd = ["pg_dump", *self._pg_connection_args(), "--no-password"]
+        # A line per dumped object; only worth producing when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            cmd.append("--verbose")
+        return cmd
+    
+    def _jobs(self) -> int:
+        """Parallel pg_dump/pg_restore workers"""
+        return self.config.pg_jobs or os.cpu_count() or 1
+    
+    def _decompressor_command(self, backup_path: str) -> Optional[List[str]]:
+        """Command decompressing ``backup_path`` to stdout, or None if it is uncompressed"""
+        if backup_path.endswith('.zst'):
+            return ["zstd", "-dcq", backup_path]
+        if backup_path.endswith('.gz'):
+            return ["pigz" if shutil.which("pigz") else "gzip", "-dc", backup_path]
+        return None
+    
+    def _compression_codec(self) -> str:
+        """Codec to compress the next dump with"""
+        if not self.config.compression:
+            return "none"
+        codec = self.config.compression_codec
+        if codec not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unknown compression codec: {codec}")
+        if codec == "zstd" and not shutil.which("zstd"):
+            logger.warning("zstd not installed, compressing backup with gzip")
+            return "gzip"
+        return codec
+    
+    def _compressor_command(self, codec: str) -> List[str]:
+        """Command compressing stdin to stdout with ``codec`` on all cores"""
+        if codec == "zstd":
+            return ["zstd", "-3", "-T0", "-cq"]
+        if shutil.which("pigz"):
+            return ["pigz", "-p", str(os.cpu_count() or 1), "-c"]
+        return ["gzip", "-c"]
+
+# How much of a failed command's stderr is included in the error
+STDERR_TAIL_BYTES = 4096
+
+def _run_pipeline(
+    commands: List[List[str]],
+    stdout=None,
+    env: Optional[Dict[str, str]] = None,
+    consume: Optional[Callable[[BinaryIO], Any]] = None
+):
+    """Run ``commands`` connected by pipes, the last one writing to ``stdout``
+    
+    ``stdout`` is a binary file, ``subprocess.DEVNULL``, or ``subprocess.PIPE``
+    with a ``consume`` callback that reads the output to EOF; its return
+    value is returned once every command has succeeded. Each command's stderr
+    is spooled to a temporary file, so a chatty command never blocks on a
+    full pipe, and is included in the exception raised if it fails.
+    """
+    with ExitStack() as stack:
+        stages = []
+        stdin = None
+        for i, cmd in enumerate(commands):
+            errors = stack.enter_context(tempfile.TemporaryFile())
+            last = i == len(commands) - 1
+            process = subprocess.Popen(
+                cmd, env=env, stdin=stdin,
+                stdout=stdout if last else subprocess.PIPE, stderr=errors
+            )
+            if stdin is not None:
+                # This stage holds the only read end now, so the previous
+                # one gets SIGPIPE if it dies
+                stdin.close()
+            stdin = process.stdout
+            stages.append((process, cmd, errors))
+        
+        result = None
+        try:
+            if consume is not None:
+                result = consume(stages[-1][0].stdout)
+        finally:
+            if consume is not None:
+                stages[-1][0].stdout.close()
+            for process, _, _ in stages:
+                process.wait()
+        
+        failed = [stage for stage in stages if stage[0].returncode != 0]
+        if failed:
+            # Stages upstream of a failure die of SIGPIPE; report the cause
+            process, cmd, errors = next(
+                (stage for stage in failed if stage[0].returncode != -signal.SIGPIPE), failed[0]
+            )
+            # Only the end of the output, where the error is, gets decoded
+            size = errors.seek(0, os.SEEK_END)
+            errors.seek(max(0, size - STDERR_TAIL_BYTES))
+            message = errors.read().decode(errors='replace').strip()
+            raise Exception(f"{cmd[0]} failed: {message or f'exit code {process.returncode}'}")
+    
+    return result
+
+class _CountingReader:
+    """Read-only stream wrapper counting the bytes read through it"""
+    
+    def __init__(self, raw: BinaryIO):
+        self.raw = raw
+        self.bytes_read = 0
+    
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.bytes_read += len(data)
+        return data
+
+# Files copied concurrently by a file backup
+FILE_COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+def _json_dumps(obj) -> str:
+    """Compact JSON, via orjson when installed"""
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(',', ':'))
+
+_json_loads = orjson.loads if _ORJSON_AVAILABLE else json.loads
+
+# fdatasync skips flushing unchanged metadata, but is not available everywhere
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+def _write_atomic(path: str, data: str):
+    """Replace ``path`` with ``data`` so readers see the old or new file, never a torn one"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def _copy_file(src: str, dst: str):
+    """Copy a file's data and metadata without passing the data through Python
+    
+    copy_file_range lets the filesystem share extents (reflink) or copy
+    server-side; when unsupported, shutil.copy2's sendfile path is used.
+    """
+    if not hasattr(os, "copy_file_range"):
+        shutil.copy2(src, dst)
+        return
+    
+    with open(src, 'rb') as f_in, open(dst, 'wb') as f_out:
+        remaining = os.fstat(f_in.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(f_in.fileno(), f_out.fileno(), remaining)
+                if not copied:
+                    # Some filesystems (procfs, FUSE, ...) report 0 instead of failing
+                    break
+                remaining -= copied
+        except OSError:
+            # e.g. across filesystems on older kernels
+            pass
+    
+    if remaining > 0:
+        # Rewrites dst from the start, so a partial copy is not kept
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
 
 class FileBackup:
     """Handles file system backups"""
@@ -238,7 +470,7 @@ class FileBackup:
     
     def ensure_backup_directory(self):
         """Create backup directory if it doesn't exist"""
-        Path(self.config.backup_dir).mkdir(parents=True, exist_ok=True)
+        _ensure_dir(self.config.backup_dir)
     
     def create_backup(self, backup_type: BackupType = BackupType.FULL) -> BackupInfo:
         """Create a file system backup"""
@@ -252,32 +484,59 @@ class FileBackup:
         try:
             logger.info(f"Starting {backup_type.value} file backup: {backup_id}")
             
+            # Incremental backups build on the latest backup of any kind,
+            # differential ones on the latest full backup
+            previous = None
+            if backup_type == BackupType.INCREMENTAL:
+                previous = self._load_last_manifest("files_")
+            elif backup_type == BackupType.DIFFERENTIAL:
+                previous = self._load_last_manifest("files_full_")
+            previous_files = previous["files"] if previous else {}
+            previous_dir = os.path.join(self.config.backup_dir, previous["backup_id"]) if previous else None
+            
             total_size = 0
             files_copied = 0
+            files_linked = 0
+            manifest = {}
+            copies = []
+            directories = []
             
-            # Copy each specified path
+            # Copy each specified path; the walk links unchanged files and
+            # queues the rest for the copy pool
             for source_path in self.config.file_backup_paths:
                 if os.path.exists(source_path):
-                    dest_path = os.path.join(backup_dir, os.path.basename(source_path))
-                    
-                    if os.path.isdir(source_path):
-                        shutil.copytree(source_path, dest_path)
-                    else:
-                        shutil.copy2(source_path, dest_path)
-                    
-                    # Calculate size
-                    if os.path.isdir(dest_path):
-                        for root, dirs, files in os.walk(dest_path):
-                            for file in files:
-                                file_path = os.path.join(root, file)
-                                total_size += os.path.getsize(file_path)
-                                files_copied += 1
-                    else:
-                        total_size += os.path.getsize(dest_path)
-                        files_copied += 1
+                    for src, rel_path, stat in self._walk(source_path, os.path.basename(source_path)):
+                        dest_path = os.path.join(backup_dir, rel_path)
+                        if stat is None:
+                            os.makedirs(dest_path, exist_ok=True)
+                            directories.append((src, dest_path))
+                            continue
+                        
+                        signature = [stat.st_size, stat.st_mtime_ns]
+                        manifest[rel_path] = signature
+                        total_size += stat.st_size
+                        
+                        # Unchanged files are hard-linked to the previous
+                        # backup's copy, so every backup is a full snapshot
+                        if previous_files.get(rel_path) == signature and self._link(
+                            os.path.join(previous_dir, rel_path), dest_path
+                        ):
+                            files_linked += 1
+                        else:
+                            copies.append((src, dest_path))
                 else:
                     logger.warning(f"Source path does not exist: {source_path}")
             
+            with ThreadPoolExecutor(max_workers=FILE_COPY_WORKERS) as executor:
+                for _ in executor.map(lambda copy: _copy_file(*copy), copies):
+                    files_copied += 1
+            
+            # Directory times last, as filling a directory updates its mtime
+            for src, dest_path in reversed(directories):
+                shutil.copystat(src, dest_path)
+            
+            self._write_manifest(backup_id, manifest)
+            
             # Create backup info
             backup_info = BackupInfo(
                 backup_id=backup_id,
@@ -288,15 +547,22 @@ class FileBackup:
                 file_path=backup_dir,
                 metadata={
                     "files_copied": files_copied,
+                    "files_linked": files_linked,
+                    "base_backup_id": previous["backup_id"] if previous else None,
                     "source_paths": self.config.file_backup_paths
                 }
             )
             
-            logger.info(f"File backup completed successfully: {backup_id} ({total_size} bytes, {files_copied} files)")
+            logger.info(
+                f"File backup completed successfully: {backup_id} "
+                f"({total_size} bytes, {files_copied} files copied, {files_linked} unchanged)"
+            )
             return backup_info
             
         except Exception as e:
             logger.error(f"File backup failed: {e}")
+            # The directory may have been removed underneath us
+            _forget_dir(self.config.backup_dir)
             return BackupInfo(
                 backup_id=backup_id,
                 backup_type=backup_type,
@@ -306,6 +572,61 @@ class FileBackup:
                 file_path=backup_dir,
                 metadata={"error": str(e)}
             )
+    
+    def _walk(self, path: str, rel_path: str):
+        """Yield ``(path, rel_path, stat)`` for every file under ``path``
+        
+        Directories are yielded before their contents, with ``stat`` None.
+        """
+        if not os.path.isdir(path):
+            yield path, rel_path, os.stat(path)
+            return
+        
+        yield path, rel_path, None
+        with os.scandir(path) as entries:
+            for entry in entries:
+                entry_rel_path = os.path.join(rel_path, entry.name)
+                if entry.is_dir():
+                    yield from self._walk(entry.path, entry_rel_path)
+                else:
+                    yield entry.path, entry_rel_path, entry.stat()
+    
+    def _link(self, src: str, dest: str) -> bool:
+        """Hard-link ``dest`` to ``src``, returning False if that is not possible"""
+        try:
+            os.link(src, dest)
+            return True
+        except OSError:
+            # Previous copy removed, or a filesystem without hard links
+            return False
+    
+    def _manifest_path(self, backup_id: str) -> str:
+        return os.path.join(self.config.backup_dir, f"{backup_id}.manifest.json")
+    
+    def _write_manifest(self, backup_id: str, files: Dict[str, List[int]]):
+        """Record the size and mtime of every file in a backup"""
+        _write_atomic(self._manifest_path(backup_id), _json_dumps({"backup_id": backup_id, "files": files}))
+    
+    def _load_last_manifest(self, backup_id_prefix: str) -> Optional[Dict]:
+        """Load the newest manifest whose backup still exists, if any"""
+        candidates = []
+        with os.scandir(self.config.backup_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(backup_id_prefix) and entry.name.endswith(".manifest.json"):
+                    backup_id = entry.name[:-len(".manifest.json")]
+                    if os.path.isdir(os.path.join(self.config.backup_dir, backup_id)):
+                        candidates.append((entry.stat().st_mtime_ns, entry.path))
+        
+        if not candidates:
+            return None
+        with open(max(candidates)[1], 'r') as f:
+            return _json_loads(f.read())
+
+# Objects transferred concurrently when a backup spans many files
+S3_MAX_WORKERS = 16
+# Parts each of those objects transfers in parallel, so that all the workers
+# together stay within the client's connection pool
+S3_FILE_CONCURRENCY = 4
 
 class S3Backup:
     """Handles AWS S3 backup operations"""
@@ -314,13 +635,116 @@ class S3Backup:
         self.config = config
         self.s3_client = None
         
+        # Large dumps go up and down in parallel 16 MiB parts; objects under
+        # the threshold use a single request to avoid per-part overhead
+        self.transfer_config = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=16 * 1024 * 1024,
+            max_concurrency=16,
+            use_threads=True
+        )
+        # The same part layout (and so the same ETags) for the files of a
+        # directory backup, which S3_MAX_WORKERS already transfer in parallel
+        self.file_transfer_config = TransferConfig(
+            multipart_threshold=self.transfer_config.multipart_threshold,
+            multipart_chunksize=self.transfer_config.multipart_chunksize,
+            max_concurrency=S3_FILE_CONCURRENCY,
+            use_threads=True
+        )
+        
         if self.config.s3_bucket:
             self.s3_client = boto3.client(
                 's3',
                 region_name=self.config.s3_region,
                 aws_access_key_id=self.config.aws_access_key,
-                aws_secret_access_key=self.config.aws_secret_key
+                aws_secret_access_key=self.config.aws_secret_key,
+                # One pooled connection per request either transfer mode can
+                # have in flight, kept alive between requests
+                config=Config(
+                    max_pool_connections=max(
+                        self.transfer_config.max_concurrency,
+                        S3_MAX_WORKERS * self.file_transfer_config.max_concurrency
+                    ),
+                    retries={'max_attempts': 10, 'mode': 'adaptive'},
+                    tcp_keepalive=True,
+                    s3={'addressing_style': 'virtual'}
+                )
+            )
+    
+    def _backup_key(self, backup_type: BackupType, backup_id: str) -> str:
+        """S3 key (or key prefix, for directories) of a backup"""
+        return f"backups/{backup_type.value}/{backup_id}"
+    
+    def _list_objects(self, prefix: str) -> Dict[str, Tuple[int, str]]:
+        """Size and ETag of every object under ``prefix``, keyed by relative path"""
+        objects = {}
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.config.s3_bucket, Prefix=f"{prefix}/"):
+            for obj in page.get('Contents', []):
+                objects[obj['Key'][len(prefix) + 1:]] = (obj['Size'], obj['ETag'].strip('"'))
+        return objects
+    
+    def _etag(self, path: str, size: int) -> str:
+        """ETag S3 gives ``path`` when uploaded with ``transfer_config``
+        
+        That is the MD5 of the content, or for multipart uploads the MD5 of
+        the concatenated part MD5s followed by the part count.
+        """
+        with open(path, 'rb') as f:
+            if size < self.transfer_config.multipart_threshold:
+                return hashlib.md5(f.read()).hexdigest()
+            
+            part_digests = []
+            while part := f.read(self.transfer_config.multipart_chunksize):
+                part_digests.append(hashlib.md5(part).digest())
+        return f"{hashlib.md5(b''.join(part_digests)).hexdigest()}-{len(part_digests)}"
+    
+    def _partial_key(self, backup_type: BackupType, backup_id: str) -> str:
+        """S3 key a streamed backup is staged under until it is published
+        
+        Kept outside ``backups/`` so listings and downloads never see it.
+        """
+        return f"partial/{self._backup_key(backup_type, backup_id)}"
+    
+    def upload_stream(self, stream: BinaryIO, backup_type: BackupType, backup_id: str) -> Tuple[str, int]:
+        """Upload a non-seekable stream as one object using parallel multipart parts
+        
+        The object is staged under a partial key, as the stream may end early
+        when the command producing it fails; ``publish_stream`` moves it to the
+        backup's key. Returns the staged object's ``s3://`` URI and the number
+        of bytes uploaded.
+        """
+        s3_key = self._partial_key(backup_type, backup_id)
+        reader = _CountingReader(stream)
+        self.s3_client.upload_fileobj(reader, self.config.s3_bucket, s3_key, Config=self.transfer_config)
+        logger.info(f"Backup streamed to S3: {s3_key}")
+        return f"s3://{self.config.s3_bucket}/{s3_key}", reader.bytes_read
+    
+    def publish_stream(self, backup_info: BackupInfo) -> bool:
+        """Move a complete streamed backup from its partial key to its backup key"""
+        partial_key = self._partial_key(backup_info.backup_type, backup_info.backup_id)
+        s3_key = self._backup_key(backup_info.backup_type, backup_info.backup_id)
+        try:
+            self.s3_client.copy(
+                {'Bucket': self.config.s3_bucket, 'Key': partial_key},
+                self.config.s3_bucket, s3_key, Config=self.transfer_config
+            )
+            self.s3_client.delete_object(Bucket=self.config.s3_bucket, Key=partial_key)
+            backup_info.file_path = f"s3://{self.config.s3_bucket}/{s3_key}"
+            logger.info(f"Backup published to S3: {s3_key}")
+            return True
+        except ClientError as e:
+            logger.error(f"S3 publish failed: {e}")
+            return False
+    
+    def discard_stream(self, backup_type: BackupType, backup_id: str):
+        """Delete what a failed streamed backup left under its partial key"""
+        try:
+            self.s3_client.delete_object(
+                Bucket=self.config.s3_bucket, Key=self._partial_key(backup_type, backup_id)
             )
+        except ClientError as e:
+            logger.error(f"S3 cleanup of partial backup {backup_id} failed: {e}")
     
     def upload_backup(self, backup_info: BackupInfo) -> bool:
         """Upload backup to S3"""
@@ -330,19 +754,65 @@ class S3Backup:
         
         try:
             # Determine S3 key
-            s3_key = f"backups/{backup_info.backup_type.value}/{backup_info.backup_id}"
+            s3_key = self._backup_key(backup_info.backup_type, backup_info.backup_id)
             
             if os.path.isfile(backup_info.file_path):
                 # Upload single file
-                self.s3_client.upload_file(backup_info.file_path, self.config.s3_bucket, s3_key)
+                self.s3_client.upload_file(
+                    backup_info.file_path, self.config.s3_bucket, s3_key, Config=self.transfer_config
+                )
             else:
-                # Upload directory
+                # Upload directory, several files at a time
+                uploads = []
                 for root, dirs, files in os.walk(backup_info.file_path):
                     for file in files:
                         local_path = os.path.join(root, file)
-                        relative_path = os.path.relpath(local_path, backup_info.file_path)
-                        s3_key_file = f"{s3_key}/{relative_path}".replace("\\", "/")
-                        self.s3_client.upload_file(local_path, self.config.s3_bucket, s3_key_file)
+                        relative_path = os.path.relpath(local_path, backup_info.file_path).replace("\\", "/")
+                        uploads.append((local_path, relative_path))
+                
+                # Objects already uploaded under this key (an earlier, partial
+                # attempt) are kept, and those unchanged since the base backup
+                # are copied server-side instead of uploaded again
+                existing = self._list_objects(s3_key)
+                base_key = None
+                base_objects = {}
+                base_backup_id = backup_info.metadata.get("base_backup_id")
+                if base_backup_id:
+                    # Backup IDs are "<kind>_<type>_<timestamp>"
+                    base_key = self._backup_key(BackupType(base_backup_id.split("_")[1]), base_backup_id)
+                    base_objects = self._list_objects(base_key)
+                
+                def upload(local_path: str, relative_path: str) -> str:
+                    size = os.path.getsize(local_path)
+                    etag = None
+                    
+                    if relative_path in existing and existing[relative_path][0] == size:
+                        etag = self._etag(local_path, size)
+                        if existing[relative_path][1] == etag:
+                            return "kept"
+                    
+                    if relative_path in base_objects and base_objects[relative_path][0] == size:
+                        etag = etag or self._etag(local_path, size)
+                        if base_objects[relative_path][1] == etag:
+                            self.s3_client.copy(
+                                {'Bucket': self.config.s3_bucket, 'Key': f"{base_key}/{relative_path}"},
+                                self.config.s3_bucket, f"{s3_key}/{relative_path}",
+                                Config=self.file_transfer_config
+                            )
+                            return "copied"
+                    
+                    self.s3_client.upload_file(
+                        local_path, self.config.s3_bucket, f"{s3_key}/{relative_path}",
+                        Config=self.file_transfer_config
+                    )
+                    return "uploaded"
+                
+                with ThreadPoolExecutor(max_workers=S3_MAX_WORKERS) as executor:
+                    outcomes = Counter(executor.map(lambda args: upload(*args), uploads))
+                logger.info(
+                    f"{s3_key}: {outcomes['uploaded']} files uploaded, {outcomes['copied']} copied "
+                    f"from the base backup, {outcomes['kept']} already present"
+                )
             
             logger.info(f"Backup uploaded to S3: {s3_key}")
             return True
@@ -368,7 +838,9 @@ class S3Backup:
                 logger.error(f"No backup found with ID: {backup_id}")
                 return False
             
-            # Download all files
+            # Download all files, several at a time, skipping local copies
+            # that already match
+            downloads = []
             for obj in response['Contents']:
                 s3_key = obj['Key']
                 local_file_path = os.path.join(local_path, os.path.basename(s3_key))
@@ -376,7 +848,23 @@ class S3Backup:
                 # Create directory if needed
                 os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
                 
-                self.s3_client.download_file(self.config.s3_bucket, s3_key, local_file_path)
+                if (
+                    os.path.isfile(local_file_path)
+                    and os.path.getsize(local_file_path) == obj['Size']
+                    and self._etag(local_file_path, obj['Size']) == obj['ETag'].strip('"')
+                ):
+                    continue
+                downloads.append((s3_key, local_file_path))
+            
+            # A lone dump gets every part slot to itself
+            transfer_config = self.transfer_config if len(downloads) == 1 else self.file_transfer_config
+            with ThreadPoolExecutor(max_workers=S3_MAX_WORKERS) as executor:
+                list(executor.map(
+                    lambda download: self.s3_client.download_file(
+                        self.config.s3_bucket, download[0], download[1], Config=transfer_config
+                    ),
+                    downloads
+                ))
             
             logger.info(f"Backup downloaded from S3: {backup_id}")
             return True
@@ -393,57 +881,68 @@ class BackupManager:
         self.db_backup = DatabaseBackup(config)
         self.file_backup = FileBackup(config)
         self.s3_backup = S3Backup(config)
-        self.backup_log_file = os.path.join(config.backup_dir, "backup_log.json")
+        self.backup_log_file = os.path.join(config.backup_dir, "backup_log.jsonl")
+        # Loaded from the log on first use, then kept in step with it
+        self._backups_cache: Optional[List[BackupInfo]] = None
+        self._migrate_legacy_log()
+        # Local paths of logged backups by backup ID and by timestamp, so
+        # restores don't have to scan backup_dir
+        self._path_index: Dict[str, List[str]] = {}
+        self._index_backups(self.list_backups())
     
-    def create_full_backup(self) -> List[BackupInfo]:
-        """Create a full backup (database + files)"""
-        logger.info("Starting full backup process")
-        
-        backups = []
-        
-        # Database backup
-        db_backup = self.db_backup.create_backup(BackupType.FULL)
-        backups.append(db_backup)
-        
-        # File backup
-        file_backup = self.file_backup.create_backup(BackupType.FULL)
-        backups.append(file_backup)
-        
-        # Upload to S3 if configured
-        if self.s3_backup.s3_client:
-            for backup in backups:
-                if backup.status == BackupStatus.SUCCESS:
-                    self.s3_backup.upload_backup(backup)
+    def _create_db_backup(self, backup_type: BackupType) -> BackupInfo:
+        """Create a database backup, streaming it to S3 when configured"""
+        if self.config.stream_to_s3 and self.s3_backup.s3_client:
+            backup = self.db_backup.create_backup(backup_type, upload=self.s3_backup.upload_stream)
+            # The dump only reaches its backup key once every command in the
+            # pipeline is known to have succeeded
+            if backup.status != BackupStatus.SUCCESS:
+                self.s3_backup.discard_stream(backup_type, backup.backup_id)
+            elif not self.s3_backup.publish_stream(backup):
+                backup.status = BackupStatus.FAILED
+                backup.metadata["error"] = "Publishing the streamed dump failed"
+            return backup
+        return self.db_backup.create_backup(backup_type)
+    
+    def _create_and_upload(self, create: Callable[[BackupType], BackupInfo], backup_type: BackupType) -> BackupInfo:
+        """Create one backup and upload it to S3 if configured"""
+        backup = create(backup_type)
+        if (
+            self.s3_backup.s3_client
+            and backup.status == BackupStatus.SUCCESS
+            and not backup.file_path.startswith("s3://")
+        ):
+            self.s3_backup.upload_backup(backup)
+        return backup
+    
+    def _create_backups(self, backup_type: BackupType) -> List[BackupInfo]:
+        """Back up the database and files concurrently, then log both"""
+        # The two touch disjoint resources, and each is uploaded as soon as
+        # it is done rather than after both
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(self._create_and_upload, self._create_db_backup, backup_type),
+                executor.submit(self._create_and_upload, self.file_backup.create_backup, backup_type)
+            ]
+            backups = [future.result() for future in futures]
         
         # Log backup
         self._log_backups(backups)
         
         return backups
     
+    def create_full_backup(self) -> List[BackupInfo]:
+        """Create a full backup (database + files)"""
+        logger.info("Starting full backup process")
+        return self._create_backups(BackupType.FULL)
+    
     def create_incremental_backup(self) -> List[BackupInfo]:
         """Create an incremental backup"""
         logger.info("Starting incremental backup process")
         
-        backups = []
-        
-        # For now, treat incremental as full backup
-        # In a real implementation, you would track changes since last backup
-        db_backup = self.db_backup.create_backup(BackupType.INCREMENTAL)
-        backups.append(db_backup)
-        
-        file_backup = self.file_backup.create_backup(BackupType.INCREMENTAL)
-        backups.append(file_backup)
-        
-        # Upload to S3 if configured
-        if self.s3_backup.s3_client:
-            for backup in backups:
-                if backup.status == BackupStatus.SUCCESS:
-                    self.s3_backup.upload_backup(backup)
-        
-        # Log backup
-        self._log_backups(backups)
-        
-        return backups
+        # Files only copy what changed since the last backup; the database
+        # is still dumped in full
+        return self._create_backups(BackupType.INCREMENTAL)
     
     def restore_from_backup(self, backup_id: str, restore_type: str = "full") -> bool:
         """Restore from a specific backup"""
@@ -484,111 +983,189 @@ class BackupManager:
         """Remove old backups based on retention policy"""
         logger.info("Starting backup cleanup")
         
-        cutoff_date = datetime.now() - timedelta(days=self.config.retention_days)
+        cutoff = (datetime.now() - timedelta(days=self.config.retention_days)).timestamp()
         
-        # Clean up local backups
-        for item in os.listdir(self.config.backup_dir):
-            item_path = os.path.join(self.config.backup_dir, item)
-            
-            if os.path.isfile(item_path):
-                # Check file modification time
-                mod_time = datetime.fromtimestamp(os.path.getmtime(item_path))
-                if mod_time < cutoff_date:
-                    os.remove(item_path)
-                    logger.info(f"Removed old backup file: {item}")
-            
-            elif os.path.isdir(item_path) and item.startswith(('db_', 'files_')):
-                # Check directory modification time
-                mod_time = datetime.fromtimestamp(os.path.getmtime(item_path))
-                if mod_time < cutoff_date:
-                    shutil.rmtree(item_path)
-                    logger.info(f"Removed old backup directory: {item}")
+        # Clean up local backups; scandir entries carry their file type, and
+        # stat them at most once
+        with os.scandir(self.config.backup_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    # Check file modification time
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        logger.info(f"Removed old backup file: {entry.name}")
+                
+                elif entry.is_dir() and entry.name.startswith(('db_', 'files_')):
+                    # Check directory modification time
+                    if entry.stat().st_mtime < cutoff:
+                        shutil.rmtree(entry.path)
+                        logger.info(f"Removed old backup directory: {entry.name}")
     
     def list_backups(self) -> List[BackupInfo]:
         """List all available backups"""
-        backups = []
-        
-        # Read from log file
-        if os.path.exists(self.backup_log_file):
-            with open(self.backup_log_file, 'r') as f:
-                log_data = json.load(f)
-                for backup_data in log_data:
-                    backup_info = BackupInfo(
-                        backup_id=backup_data['backup_id'],
-                        backup_type=BackupType(backup_data['backup_type']),
-                        timestamp=datetime.fromisoformat(backup_data['timestamp']),
-                        status=BackupStatus(backup_data['status']),
-                        size_bytes=backup_data['size_bytes'],
-                        file_path=backup_data['file_path'],
-                        metadata=backup_data['metadata']
-                    )
-                    backups.append(backup_info)
+        if self._backups_cache is None:
+            self._backups_cache = []
+            
+            # Read from log file, one backup per line
+            if os.path.exists(self.backup_log_file):
+                with open(self.backup_log_file, 'r') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            self._backups_cache.append(self._backup_from_dict(_json_loads(line)))
+                        except ValueError:
+                            # A record torn by a crash mid-append
+                            logger.warning(f"Skipping unreadable backup log entry: {line[:80]!r}")
         
-        return sorted(backups, key=lambda x: x.timestamp, reverse=True)
+        return sorted(self._backups_cache, key=lambda x: x.timestamp, reverse=True)
     
     def _log_backups(self, backups: List[BackupInfo]):
-        """Log backup information to file"""
-        log_data = []
+        """Append backup information to the log file"""
+        # One write per batch, synced before the backups count as logged
+        lines = "".join(_json_dumps(self._backup_to_dict(backup)) + "\n" for backup in backups)
+        with open(self.backup_log_file, 'a') as f:
+            f.write(lines)
+            f.flush()
+            _fdatasync(f.fileno())
+        
+        if self._backups_cache is not None:
+            self._backups_cache.extend(backups)
+        self._index_backups(backups)
+    
+    def _index_backups(self, backups: List[BackupInfo]):
+        """Add successful local backups to the path index"""
+        for backup in backups:
+            if backup.status != BackupStatus.SUCCESS or backup.file_path.startswith("s3://"):
+                continue
+            # Restores accept the shared timestamp of a run as its ID
+            for key in (backup.backup_id, backup.timestamp.strftime('%Y%m%d_%H%M%S')):
+                self._path_index.setdefault(key, []).append(backup.file_path)
+    
+    def _migrate_legacy_log(self):
+        """Convert a backup_log.json array into the append-only JSONL log"""
+        legacy_log_file = os.path.join(self.config.backup_dir, "backup_log.json")
+        if not os.path.exists(legacy_log_file):
+            return
         
-        # Read existing log
+        with open(legacy_log_file, 'r') as f:
+            lines = [_json_dumps(backup_data) + "\n" for backup_data in json.load(f)]
         if os.path.exists(self.backup_log_file):
             with open(self.backup_log_file, 'r') as f:
-                log_data = json.load(f)
+                lines.extend(f)
         
-        # Add new backups
-        for backup in backups:
-            backup_data = {
-                'backup_id': backup.backup_id,
-                'backup_type': backup.backup_type.value,
-                'timestamp': backup.timestamp.isoformat(),
-                'status': backup.status.value,
-                'size_bytes': backup.size_bytes,
-                'file_path': backup.file_path,
-                'metadata': backup.metadata
-            }
-            log_data.append(backup_data)
-        
-        # Write updated log
-        with open(self.backup_log_file, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        # Replace atomically, so an interrupted migration can simply rerun
+        _write_atomic(self.backup_log_file, "".join(lines))
+        os.remove(legacy_log_file)
+        logger.info(f"Migrated {legacy_log_file} to {self.backup_log_file}")
+    
+    @staticmethod
+    def _backup_to_dict(backup: BackupInfo) -> Dict:
+        return {
+            'backup_id': backup.backup_id,
+            'backup_type': backup.backup_type.value,
+            'timestamp': backup.timestamp.isoformat(),
+            'status': backup.status.value,
+            'size_bytes': backup.size_bytes,
+            'file_path': backup.file_path,
+            'metadata': backup.metadata
+        }
+    
+    @staticmethod
+    def _backup_from_dict(backup_data: Dict) -> BackupInfo:
+        return BackupInfo(
+            backup_id=backup_data['backup_id'],
+            backup_type=BackupType(backup_data['backup_type']),
+            timestamp=datetime.fromisoformat(backup_data['timestamp']),
+            status=BackupStatus(backup_data['status']),
+            size_bytes=backup_data['size_bytes'],
+            file_path=backup_data['file_path'],
+            metadata=backup_data['metadata']
+        )
     
     def _find_backup_files(self, backup_id: str, prefix: str) -> List[str]:
         """Find backup files matching the given ID and prefix"""
-        files = []
-        for item in os.listdir(self.config.backup_dir):
-            if item.startswith(prefix) and backup_id in item:
-                files.append(os.path.join(self.config.backup_dir, item))
-        return files
+        files = [
+            path for path in self._path_index.get(backup_id, [])
+            if os.path.basename(path).startswith(prefix) and os.path.isfile(path)
+        ]
+        if files:
+            return files
+        
+        # Not logged by this manager; fall back to a directory scan
+        with os.scandir(self.config.backup_dir) as entries:
+            return [
+                entry.path for entry in entries
+                if entry.name.startswith(prefix) and backup_id in entry.name
+            ]
     
     def _find_backup_dirs(self, backup_id: str, prefix: str) -> List[str]:
         """Find backup directories matching the given ID and prefix"""
-        dirs = []
-        for item in os.listdir(self.config.backup_dir):
-            item_path = os.path.join(self.config.backup_dir, item)
-            if os.path.isdir(item_path) and item.startswith(prefix) and backup_id in item:
-                dirs.append(item_path)
-        return dirs
+        dirs = [
+            path for path in self._path_index.get(backup_id, [])
+            if os.path.basename(path).startswith(prefix) and os.path.isdir(path)
+        ]
+        if dirs:
+            return dirs
+        
+        # Not logged by this manager; fall back to a directory scan
+        with os.scandir(self.config.backup_dir) as entries:
+            return [
+                entry.path for entry in entries
+                if entry.name.startswith(prefix) and backup_id in entry.name and entry.is_dir()
+            ]
+
+def _next_run(after: datetime, at: dt_time) -> datetime:
+    """First time of day ``at`` strictly after ``after``"""
+    run = after.replace(hour=at.hour, minute=at.minute, second=0, microsecond=0)
+    return run if run > after else run + timedelta(days=1)
+
+async def _run_job(job: Callable[[], Any]):
+    """Run a blocking job in a worker thread, logging any failure"""
+    try:
+        await asyncio.to_thread(job)
+    except Exception:
+        logger.exception(f"Scheduled job {job.__name__} failed")
+
+async def _run_schedule(jobs: List[Tuple[dt_time, Callable[[], Any]]]):
+    """Run each job daily at its time of day
+    
+    Sleeps until the next job is due instead of polling, and starts every
+    job in its own thread so a long backup never delays the ones after it.
+    """
+    running = set()
+    last_run = datetime.now()
+    while True:
+        # Never before the last run, in case the sleep woke up early
+        now = max(datetime.now(), last_run)
+        due = min(_next_run(now, at) for at, _ in jobs)
+        await asyncio.sleep((due - datetime.now()).total_seconds())
+        
+        for at, job in jobs:
+            if _next_run(now, at) == due:
+                task = asyncio.create_task(_run_job(job))
+                running.add(task)
+                task.add_done_callback(running.discard)
+        last_run = due
 
 def schedule_backups(config: BackupConfig):
     """Schedule automated backups"""
     manager = BackupManager(config)
     
-    # Schedule daily full backups at 2 AM
-    schedule.every().day.at("02:00").do(manager.create_full_backup)
+    # Daily full backups at 2 AM
+    jobs = [(dt_time(2, 0), manager.create_full_backup)]
     
-    # Schedule hourly incremental backups during business hours
+    # Hourly incremental backups during business hours
     for hour in range(9, 17):  # 9 AM to 5 PM
-        schedule.every().day.at(f"{hour:02d}:00").do(manager.create_incremental_backup)
+        jobs.append((dt_time(hour, 0), manager.create_incremental_backup))
     
-    # Schedule daily cleanup at 3 AM
-    schedule.every().day.at("03:00").do(manager.cleanup_old_backups)
+    # Daily cleanup at 3 AM
+    jobs.append((dt_time(3, 0), manager.cleanup_old_backups))
     
     logger.info("Backup schedule configured")
     
     # Run scheduler
-    while True:
-        schedule.run_pending()
-        time.sleep(60)  # Check every minute
+    asyncio.run(_run_schedule(jobs))
 
 # Example usage
 if __name__ == "__main__":
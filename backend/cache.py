@@ -3,19 +3,107 @@ Caching Module for Innovative School Platform
 Implements Redis-based caching for improved performance
 """
 
+import inspect
 import json
 import pickle
-from typing import Any, Optional, Union, List, Dict
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Union, List, Dict, Tuple
 from datetime import datetime, timedelta
 import logging
-from functools import wraps
+from functools import lru_cache, wraps
 import hashlib
 
 import redis
-from redis.exceptions import RedisError
+import redis.asyncio
+from redis.exceptions import RedisError, ResponseError
+
+try:
+    from redis.cache import CacheConfig as ClientCacheConfig
+    _CLIENT_CACHE_AVAILABLE = True
+except ImportError:
+    _CLIENT_CACHE_AVAILABLE = False
+
+try:
+    import msgspec
+    _MSGSPEC_AVAILABLE = True
+except ImportError:
+    _MSGSPEC_AVAILABLE = False
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+try:
+    import xxhash
+    _XXHASH_AVAILABLE = True
+except ImportError:
+    _XXHASH_AVAILABLE = False
+
+try:
+    import zstandard
+    _ZSTANDARD_AVAILABLE = True
+except ImportError:
+    _ZSTANDARD_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Keys requested per SCAN step
+SCAN_COUNT = 1000
+
+# Scans one page and unlinks its matches server-side, returning the next
+# cursor and the number of keys removed. One page per call keeps each script
+# short, so other clients are never blocked for the whole keyspace.
+_UNLINK_PAGE_SCRIPT = """
+local page = redis.call('SCAN', ARGV[1], 'MATCH', ARGV[2], 'COUNT', ARGV[3])
+local keys = page[2]
+if #keys > 0 then
+    redis.call('UNLINK', unpack(keys))
+end
+return {page[1], #keys}
+"""
+
+# Serialized values at least this large are stored zstd-compressed
+COMPRESSION_THRESHOLD = 1024
+COMPRESSION_LEVEL = 3
+
+# One-byte header on every stored value naming its encoding
+_HEADER_RAW = b"\x00"
+_HEADER_ZSTD = b"\x01"
+
+# zstd contexts are not thread-safe, so each thread gets its own pair
+_zstd_local = threading.local()
+
+def _zstd_compressor() -> "zstandard.ZstdCompressor":
+    compressor = getattr(_zstd_local, "compressor", None)
+    if compressor is None:
+        compressor = _zstd_local.compressor = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL)
+    return compressor
+
+def _zstd_decompressor() -> "zstandard.ZstdDecompressor":
+    decompressor = getattr(_zstd_local, "decompressor", None)
+    if decompressor is None:
+        decompressor = _zstd_local.decompressor = zstandard.ZstdDecompressor()
+    return decompressor
+
+# Returned by get_or_miss for absent keys, so a cached None reads as a hit
+_MISS = object()
+
+def _json_dumps(data: Any) -> bytes:
+    """Encode a cache value as JSON"""
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, default=str).encode('utf-8')
+
+def _json_loads(data: bytes) -> Any:
+    """Decode a JSON cache value"""
+    if _ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(bytes(data).decode('utf-8'))
+
 class CacheConfig:
     """Configuration for caching system"""
     
@@ -27,7 +115,13 @@ class CacheConfig:
         password: Optional[str] = None,
         default_ttl: int = 3600,  # 1 hour
         key_prefix: str = "innovative_school:",
-        serialize_method: str = "json"  # json or pickle
+        serialize_method: str = "msgpack",  # msgpack, json or pickle
+        max_connections: int = 50,
+        pool_timeout: int = 2,  # seconds to wait for a free connection
+        health_check_interval: int = 30,
+        local_cache_size: int = 10_000,  # 0 disables the in-process cache
+        local_cache_ttl: int = 60,
+        client_tracking: bool = True  # RESP3 client-side caching when the server supports it
     ):
         self.host = host
         self.port = port
@@ -36,6 +130,53 @@ class CacheConfig:
         self.default_ttl = default_ttl
         self.key_prefix = key_prefix
         self.serialize_method = serialize_method
+        self.max_connections = max_connections
+        self.pool_timeout = pool_timeout
+        self.health_check_interval = health_check_interval
+        self.local_cache_size = local_cache_size
+        self.local_cache_ttl = local_cache_ttl
+        self.client_tracking = client_tracking
+
+def _redis_operation(action: str, default: Any = None):
+    """Guard a CacheManager method against a missing client and Redis errors
+    
+    Returns ``default`` instead, calling it with the method's arguments when it
+    is callable. ``action`` is formatted with those arguments for the log.
+    Coroutine methods are guarded the same way against the asyncio client.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+        
+        def fail(self, args, kwargs, error=None):
+            if error is not None:
+                bound = signature.bind(self, *args, **kwargs)
+                bound.apply_defaults()
+                logger.error(f"Failed to {action.format(**bound.arguments)}: {error}")
+            return default(*args, **kwargs) if callable(default) else default
+        
+        if inspect.iscoroutinefunction(method):
+            @wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                if self.async_client is None:
+                    return fail(self, args, kwargs)
+                try:
+                    return await method(self, *args, **kwargs)
+                except RedisError as e:
+                    return fail(self, args, kwargs, e)
+            
+            return async_wrapper
+        
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.redis_client is None:
+                return fail(self, args, kwargs)
+            try:
+                return method(self, *args, **kwargs)
+            except RedisError as e:
+                return fail(self, args, kwargs, e)
+        
+        return wrapper
+    return decorator
 
 class CacheManager:
     """Main cache management class"""
@@ -43,50 +184,155 @@ class CacheManager:
     def __init__(self, config: CacheConfig):
         self.config = config
         self.redis_client = None
+        self.async_client = None
+        # redis-py sends bytes keys as-is, so encode the prefix once
+        self._prefix_bytes = self.config.key_prefix.encode('utf-8')
+        # In-process LRU in front of Redis holding serialized values, so hot
+        # keys skip the round trip while callers still get their own copy.
+        # Writes from other processes show up once local_cache_ttl expires.
+        self._local: "OrderedDict[bytes, Tuple[bytes, float]]" = OrderedDict()
+        self._local_lock = threading.Lock()
+        self._local_size = self.config.local_cache_size
+        self._default_ttl = self.config.default_ttl
+        if self.config.serialize_method == "msgpack" and not _MSGSPEC_AVAILABLE:
+            logger.warning("msgspec not installed, serializing cache values with json")
+            self.config.serialize_method = "json"
+        # Codec resolved once so every operation skips the method dispatch
+        if self.config.serialize_method == "msgpack":
+            # Reused across calls; unsupported types are stored as str like json's default=str
+            self._encode = msgspec.msgpack.Encoder(enc_hook=str).encode
+            self._decode = msgspec.msgpack.Decoder().decode
+        elif self.config.serialize_method == "json":
+            self._encode, self._decode = _json_dumps, _json_loads
+        elif self.config.serialize_method == "pickle":
+            self._encode, self._decode = pickle.dumps, pickle.loads
+        else:
+            raise ValueError(f"Unsupported serialize method: {self.config.serialize_method}")
         self._connect()
     
     def _connect(self):
         """Establish Redis connection"""
+        # Requests wait for a free connection instead of failing when the
+        # pool is exhausted, and idle connections are pinged before reuse
+        pool_kwargs = dict(
+            host=self.config.host,
+            port=self.config.port,
+            db=self.config.db,
+            password=self.config.password,
+            max_connections=self.config.max_connections,
+            timeout=self.config.pool_timeout,
+            decode_responses=False,  # We'll handle encoding ourselves
+            socket_connect_timeout=5,
+            socket_timeout=5,
+            socket_keepalive=True,
+            retry_on_timeout=True,
+            health_check_interval=self.config.health_check_interval
+        )
+        # Over RESP3 the server tracks the keys each connection reads and
+        # pushes invalidations, so redis-py's client-side cache never serves
+        # stale values and replaces the TTL-bounded local cache
+        if self.config.client_tracking and self.config.local_cache_size and _CLIENT_CACHE_AVAILABLE:
+            try:
+                sync_kwargs = dict(
+                    pool_kwargs,
+                    protocol=3,
+                    cache_config=ClientCacheConfig(max_size=self.config.local_cache_size)
+                )
+                self._open_clients(sync_kwargs, pool_kwargs)
+                self._local_size = 0
+                logger.info("Redis connection established with client-side caching")
+                return
+            except ResponseError as e:
+                # Servers before Redis 6 reject the RESP3 handshake
+                logger.warning(f"Redis client-side caching unavailable, using the local cache: {e}")
+            except RedisError as e:
+                logger.error(f"Failed to connect to Redis: {e}")
+                self.redis_client = None
+                self.async_client = None
+                return
+        
         try:
-            self.redis_client = redis.Redis(
-                host=self.config.host,
-                port=self.config.port,
-                db=self.config.db,
-                password=self.config.password,
-                decode_responses=False,  # We'll handle encoding ourselves
-                socket_connect_timeout=5,
-                socket_timeout=5,
-                retry_on_timeout=True
-            )
-            # Test connection
-            self.redis_client.ping()
+            self._open_clients(pool_kwargs, pool_kwargs)
             logger.info("Redis connection established successfully")
         except RedisError as e:
             logger.error(f"Failed to connect to Redis: {e}")
             self.redis_client = None
-    
-    def _get_key(self, key: str) -> str:
+            self.async_client = None
+    
+    def _open_clients(self, sync_kwargs: Dict[str, Any], async_kwargs: Dict[str, Any]):
+        """Create and ping the sync client, then create the asyncio client"""
+        self.redis_client = redis.Redis(connection_pool=redis.BlockingConnectionPool(**sync_kwargs))
+        # Sent with EVALSHA, loading the script on first use
+        self._unlink_page = self.redis_client.register_script(_UNLINK_PAGE_SCRIPT)
+        # Test connection
+        self.redis_client.ping()
+        # Used by the coroutine methods so awaiting Redis frees the event loop
+        self.async_client = redis.asyncio.Redis(
+            connection_pool=redis.asyncio.BlockingConnectionPool(**async_kwargs)
+        )
+    
+    def _get_key(self, key: str) -> bytes:
         """Generate full cache key with prefix"""
-        return f"{self.config.key_prefix}{key}"
+        return self._prefix_bytes + key.encode('utf-8')
+    
+    def _local_get(self, full_key: bytes) -> Optional[bytes]:
+        """Look up a serialized value in the in-process cache"""
+        with self._local_lock:
+            entry = self._local.get(full_key)
+            if entry is None:
+                return None
+            data, cached_until = entry
+            if time.monotonic() < cached_until:
+                self._local.move_to_end(full_key)
+                return data
+            del self._local[full_key]
+            return None
+    
+    def _local_set(self, full_key: bytes, data: bytes, ttl: float):
+        """Store a serialized value in the in-process cache for at most ttl seconds"""
+        if not self._local_size:
+            return
+        # Never serve a value locally past its Redis expiry
+        cached_until = time.monotonic() + min(ttl, self.config.local_cache_ttl)
+        with self._local_lock:
+            self._local[full_key] = (data, cached_until)
+            self._local.move_to_end(full_key)
+            if len(self._local) > self._local_size:
+                self._local.popitem(last=False)
+    
+    def _local_set_read(self, full_key: bytes, data: bytes, pttl: int):
+        """Store a value read from Redis, given the key's PTTL from the same read"""
+        if pttl == -1:
+            # No expiry in Redis
+            self._local_set(full_key, data, self.config.local_cache_ttl)
+        elif pttl > 0:
+            self._local_set(full_key, data, pttl / 1000)
+    
+    def _local_discard(self, full_key: Optional[bytes] = None):
+        """Drop one key, or everything, from the in-process cache"""
+        with self._local_lock:
+            if full_key is None:
+                self._local.clear()
+            else:
+                self._local.pop(full_key, None)
     
     def _serialize(self, data: Any) -> bytes:
-        """Serialize data for storage"""
-        if self.config.serialize_method == "json":
-            return json.dumps(data, default=str).encode('utf-8')
-        elif self.config.serialize_method == "pickle":
-            return pickle.dumps(data)
-        else:
-            raise ValueError(f"Unsupported serialize method: {self.config.serialize_method}")
+        """Serialize data for storage, compressing large values"""
+        raw = self._encode(data)
+        if _ZSTANDARD_AVAILABLE and len(raw) >= COMPRESSION_THRESHOLD:
+            return _HEADER_ZSTD + _zstd_compressor().compress(raw)
+        return _HEADER_RAW + raw
     
     def _deserialize(self, data: bytes) -> Any:
         """Deserialize data from storage"""
-        if self.config.serialize_method == "json":
-            return json.loads(data.decode('utf-8'))
-        elif self.config.serialize_method == "pickle":
-            return pickle.loads(data)
-        else:
-            raise ValueError(f"Unsupported serialize method: {self.config.serialize_method}")
-    
+        header = data[:1]
+        if header == _HEADER_RAW:
+            return self._decode(data[1:])
+        if header == _HEADER_ZSTD and _ZSTANDARD_AVAILABLE:
+            return self._decode(_zstd_decompressor().decompress(memoryview(data)[1:]))
+        raise ValueError(f"Unrecognized cache value header: {header!r}")
+    
+    @_redis_operation("set cache key {key}", default=False)
     def set(
         self, 
         key: str, 
@@ -96,146 +342,182 @@ class CacheManager:
         xx: bool = False
     ) -> bool:
         """Set a cache value"""
-        if not self.redis_client:
-            return False
+        full_key = self._get_key(key)
+        serialized_value = self._serialize(value)
+        ttl = ttl or self._default_ttl
         
-        try:
-            full_key = self._get_key(key)
-            serialized_value = self._serialize(value)
-            ttl = ttl or self.config.default_ttl
-            
-            if nx:
-                return self.redis_client.set(full_key, serialized_value, ex=ttl, nx=True)
-            elif xx:
-                return self.redis_client.set(full_key, serialized_value, ex=ttl, xx=True)
-            else:
-                return self.redis_client.set(full_key, serialized_value, ex=ttl)
-        except RedisError as e:
-            logger.error(f"Failed to set cache key {key}: {e}")
-            return False
+        if nx:
+            result = self.redis_client.set(full_key, serialized_value, ex=ttl, nx=True)
+        elif xx:
+            result = self.redis_client.set(full_key, serialized_value, ex=ttl, xx=True)
+        else:
+            result = self.redis_client.set(full_key, serialized_value, ex=ttl)
+        if result:
+            self._local_set(full_key, serialized_value, ttl)
+        return result
+    
+    @_redis_operation("set cache key {key}", default=False)
+    async def aset(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Set a cache value without blocking the event loop"""
+        full_key = self._get_key(key)
+        serialized_value = self._serialize(value)
+        ttl = ttl or self._default_ttl
+        result = await self.async_client.set(full_key, serialized_value, ex=ttl)
+        if result:
+            self._local_set(full_key, serialized_value, ttl)
+        return result
     
     def get(self, key: str) -> Optional[Any]:
         """Get a cache value"""
-        if not self.redis_client:
-            return None
+        value = self.get_or_miss(key)
+        return None if value is _MISS else value
+    
+    async def aget(self, key: str) -> Optional[Any]:
+        """Get a cache value without blocking the event loop"""
+        value = await self.aget_or_miss(key)
+        return None if value is _MISS else value
+    
+    @_redis_operation("get cache key {key}", default=_MISS)
+    def get_or_miss(self, key: str) -> Any:
+        """Get a cache value, or ``_MISS`` if the key is absent
         
-        try:
-            full_key = self._get_key(key)
+        Unlike ``get``, a stored ``None`` is told apart from a miss.
+        """
+        full_key = self._get_key(key)
+        data = self._local_get(full_key)
+        if data is not None:
+            return self._decode_or_miss(key, data)
+        if not self._local_size:
+            # Plain GET, so redis-py's client-side cache serves it when enabled
             data = self.redis_client.get(full_key)
-            if data is None:
-                return None
+            return _MISS if data is None else self._decode_or_miss(key, data)
+        with self.redis_client.pipeline() as pipe:
+            data, pttl = pipe.get(full_key).pttl(full_key).execute()
+        if data is None:
+            return _MISS
+        value = self._decode_or_miss(key, data)
+        if value is not _MISS:
+            self._local_set_read(full_key, data, pttl)
+        return value
+    
+    @_redis_operation("get cache key {key}", default=_MISS)
+    async def aget_or_miss(self, key: str) -> Any:
+        """``get_or_miss`` without blocking the event loop"""
+        full_key = self._get_key(key)
+        data = self._local_get(full_key)
+        if data is not None:
+            return self._decode_or_miss(key, data)
+        if not self._local_size:
+            data = await self.async_client.get(full_key)
+            return _MISS if data is None else self._decode_or_miss(key, data)
+        async with self.async_client.pipeline() as pipe:
+            data, pttl = await pipe.get(full_key).pttl(full_key).execute()
+        if data is None:
+            return _MISS
+        value = self._decode_or_miss(key, data)
+        if value is not _MISS:
+            self._local_set_read(full_key, data, pttl)
+        return value
+    
+    def _decode_or_miss(self, key: str, data: bytes) -> Any:
+        """Deserialize a stored value, treating undecodable data as a miss"""
+        try:
             return self._deserialize(data)
-        except RedisError as e:
-            logger.error(f"Failed to get cache key {key}: {e}")
-            return None
+        except ValueError as e:
+            # Written with another serialize method
+            logger.warning(f"Failed to decode cache key {key}: {e}")
+            return _MISS
     
+    @_redis_operation("delete cache key {key}", default=False)
     def delete(self, key: str) -> bool:
         """Delete a cache key"""
-        if not self.redis_client:
-            return False
-        
-        try:
-            full_key = self._get_key(key)
-            return bool(self.redis_client.delete(full_key))
-        except RedisError as e:
-            logger.error(f"Failed to delete cache key {key}: {e}")
-            return False
+        full_key = self._get_key(key)
+        self._local_discard(full_key)
+        return bool(self.redis_client.delete(full_key))
     
+    @_redis_operation("check cache key {key}", default=False)
     def exists(self, key: str) -> bool:
-        """Check if a cache key exists"""
-        if not self.redis_client:
-            return False
+        """Check if a cache key exists
         
-        try:
-            full_key = self._get_key(key)
-            return bool(self.redis_client.exists(full_key))
-        except RedisError as e:
-            logger.error(f"Failed to check cache key {key}: {e}")
-            return False
+        Deprecated for reads: checking and then calling ``get`` costs two
+        round trips, use ``get_or_miss`` instead.
+        """
+        return bool(self.redis_client.exists(self._get_key(key)))
     
+    @_redis_operation("set expiration for cache key {key}", default=False)
     def expire(self, key: str, ttl: int) -> bool:
         """Set expiration for a cache key"""
-        if not self.redis_client:
-            return False
-        
-        try:
-            full_key = self._get_key(key)
-            return bool(self.redis_client.expire(full_key, ttl))
-        except RedisError as e:
-            logger.error(f"Failed to set expiration for cache key {key}: {e}")
-            return False
+        full_key = self._get_key(key)
+        self._local_discard(full_key)
+        return bool(self.redis_client.expire(full_key, ttl))
     
+    @_redis_operation("get TTL for cache key {key}", default=-1)
     def ttl(self, key: str) -> int:
         """Get time to live for a cache key"""
-        if not self.redis_client:
-            return -1
-        
-        try:
-            full_key = self._get_key(key)
-            return self.redis_client.ttl(full_key)
-        except RedisError as e:
-            logger.error(f"Failed to get TTL for cache key {key}: {e}")
-            return -1
+        return self.redis_client.ttl(self._get_key(key))
     
+    @_redis_operation("get keys with pattern {pattern}", default=lambda pattern="*": [])
     def keys(self, pattern: str = "*") -> List[str]:
         """Get keys matching pattern"""
-        if not self.redis_client:
-            return []
-        
-        try:
-            full_pattern = self._get_key(pattern)
-            keys = self.redis_client.keys(full_pattern)
-            # Remove prefix from returned keys
-            return [key.decode('utf-8').replace(self.config.key_prefix, '') for key in keys]
-        except RedisError as e:
-            logger.error(f"Failed to get keys with pattern {pattern}: {e}")
-            return []
+        full_pattern = self._get_key(pattern)
+        keys = self.redis_client.scan_iter(match=full_pattern, count=SCAN_COUNT)
+        # Remove prefix from returned keys
+        prefix_len = len(self._prefix_bytes)
+        return [key[prefix_len:].decode('utf-8') for key in keys]
     
+    @_redis_operation("flush cache", default=False)
     def flush(self) -> bool:
         """Flush all cache keys"""
-        if not self.redis_client:
-            return False
-        
-        try:
-            # Only flush keys with our prefix
-            keys = self.redis_client.keys(self._get_key("*"))
-            if keys:
-                return bool(self.redis_client.delete(*keys))
-            return True
-        except RedisError as e:
-            logger.error(f"Failed to flush cache: {e}")
-            return False
+        # Only flush keys with our prefix
+        self._unlink_matching(self._get_key("*"))
+        return True
+    
+    @_redis_operation("delete keys with pattern {pattern}", default=0)
+    def delete_pattern(self, pattern: str) -> int:
+        """Delete cache keys matching pattern, returning how many were found"""
+        return self._unlink_matching(self._get_key(pattern))
     
+    def _unlink_matching(self, full_pattern: bytes) -> int:
+        """Incrementally SCAN for keys and UNLINK them, one round trip per page
+        
+        Unlike KEYS, SCAN does not block the server on large keyspaces, and
+        UNLINK frees the memory in the background.
+        """
+        self._local_discard()
+        cursor = 0
+        found = 0
+        while True:
+            cursor, count = self._unlink_page(args=[cursor, full_pattern, SCAN_COUNT])
+            found += count
+            if int(cursor) == 0:
+                return found
+    
+    @_redis_operation("get multiple cache keys", default=lambda keys: [None] * len(keys))
     def mget(self, keys: List[str]) -> List[Optional[Any]]:
         """Get multiple cache values"""
-        if not self.redis_client:
-            return [None] * len(keys)
-        
+        prefix = self._prefix_bytes
+        data_list = self.redis_client.mget([prefix + key.encode('utf-8') for key in keys])
+        deserialize = self._deserialize
         try:
-            full_keys = [self._get_key(key) for key in keys]
-            data_list = self.redis_client.mget(full_keys)
-            return [self._deserialize(data) if data else None for data in data_list]
-        except RedisError as e:
-            logger.error(f"Failed to get multiple cache keys: {e}")
+            return [None if data is None else deserialize(data) for data in data_list]
+        except ValueError as e:
+            logger.warning(f"Failed to decode multiple cache keys: {e}")
             return [None] * len(keys)
     
+    @_redis_operation("set multiple cache keys", default=False)
     def mset(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
         """Set multiple cache values"""
-        if not self.redis_client:
-            return False
-        
-        try:
-            full_mapping = {self._get_key(k): self._serialize(v) for k, v in mapping.items()}
-            result = self.redis_client.mset(full_mapping)
-            
-            if result and ttl:
-                for key in mapping.keys():
-                    self.expire(key, ttl)
-            
-            return result
-        except RedisError as e:
-            logger.error(f"Failed to set multiple cache keys: {e}")
-            return False
+        ttl = ttl or self._default_ttl
+        # One round trip for every SET ... EX instead of MSET plus an EXPIRE per key
+        pipe = self.redis_client.pipeline(transaction=False)
+        entries = [(self._get_key(k), self._serialize(v)) for k, v in mapping.items()]
+        for full_key, data in entries:
+            pipe.set(full_key, data, ex=ttl)
+        results = pipe.execute()
+        for (full_key, data), result in zip(entries, results):
+            if result:
+                self._local_set(full_key, data, ttl)
+        return all(results)
 
 # Global cache instance
 _cache_manager: Optional[CacheManager] = None
@@ -249,42 +531,81 @@ def get_cache() -> Optional[CacheManager]:
     """Get global cache manager instance"""
     return _cache_manager
 
+# Deterministic encoder for cache key arguments (sorted dict keys and sets)
+_key_encoder = msgspec.msgpack.Encoder(enc_hook=str, order="deterministic") if _MSGSPEC_AVAILABLE else None
+
 def cache_key(*args, **kwargs) -> str:
     """Generate cache key from arguments"""
     # Create a deterministic key from arguments
-    key_data = {
-        'args': args,
-        'kwargs': sorted(kwargs.items())
-    }
-    key_string = json.dumps(key_data, sort_keys=True, default=str)
-    return hashlib.md5(key_string.encode()).hexdigest()
+    if _key_encoder is not None:
+        key_bytes = _key_encoder.encode((args, sorted(kwargs.items())))
+    else:
+        key_data = {
+            'args': args,
+            'kwargs': sorted(kwargs.items())
+        }
+        if _ORJSON_AVAILABLE:
+            key_bytes = orjson.dumps(key_data, default=str, option=orjson.OPT_SORT_KEYS)
+        else:
+            key_bytes = json.dumps(key_data, sort_keys=True, default=str).encode()
+    
+    if _XXHASH_AVAILABLE:
+        return xxhash.xxh3_128_hexdigest(key_bytes)
+    return hashlib.md5(key_bytes).hexdigest()
 
 def cached(
     ttl: Optional[int] = None,
     key_func: Optional[callable] = None,
     cache_condition: Optional[callable] = None
 ):
-    """Decorator for caching function results"""
+    """Decorator for caching function results
+    
+    Coroutine functions get an async wrapper that awaits Redis instead of
+    blocking the event loop.
+    """
     def decorator(func):
+        def make_key(args, kwargs) -> str:
+            if key_func:
+                return key_func(*args, **kwargs)
+            return f"{func.__name__}:{cache_key(*args, **kwargs)}"
+        
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                cache = get_cache()
+                if not cache or (cache_condition and not cache_condition(*args, **kwargs)):
+                    return await func(*args, **kwargs)
+                
+                cache_key_str = make_key(args, kwargs)
+                cached_result = await cache.aget_or_miss(cache_key_str)
+                if cached_result is not _MISS:
+                    logger.debug(f"Cache hit for {cache_key_str}")
+                    return cached_result
+                
+                result = await func(*args, **kwargs)
+                await cache.aset(cache_key_str, result, ttl)
+                logger.debug(f"Cached result for {cache_key_str}")
+                
+                return result
+            
+            return async_wrapper
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             cache = get_cache()
             if not cache:
                 return func(*args, **kwargs)
             
-            # Generate cache key
-            if key_func:
-                cache_key_str = key_func(*args, **kwargs)
-            else:
-                cache_key_str = f"{func.__name__}:{cache_key(*args, **kwargs)}"
-            
             # Check cache condition
             if cache_condition and not cache_condition(*args, **kwargs):
                 return func(*args, **kwargs)
             
+            # Generate cache key
+            cache_key_str = make_key(args, kwargs)
+            
             # Try to get from cache
-            cached_result = cache.get(cache_key_str)
-            if cached_result is not None:
+            cached_result = cache.get_or_miss(cache_key_str)
+            if cached_result is not _MISS:
                 logger.debug(f"Cache hit for {cache_key_str}")
                 return cached_result
             
@@ -304,57 +625,68 @@ def invalidate_cache(pattern: str):
     if not cache:
         return False
     
-    keys = cache.keys(pattern)
-    if not keys:
-        return True
-    
-    for key in keys:
-        cache.delete(key)
-    
-    logger.info(f"Invalidated {len(keys)} cache keys matching pattern: {pattern}")
+    count = cache.delete_pattern(pattern)
+    if count:
+        logger.info(f"Invalidated {count} cache keys matching pattern: {pattern}")
     return True
 
 # Cache key generators for common patterns
+KEY_CACHE_SIZE = 4096
+
 class CacheKeys:
-    """Common cache key patterns"""
+    """Common cache key patterns
+    
+    Keys are memoized so hot ids reuse the same string instead of formatting
+    a new one on every call.
+    """
     
     @staticmethod
+    @lru_cache(maxsize=KEY_CACHE_SIZE)
     def user(user_id: int) -> str:
         return f"user:{user_id}"
     
     @staticmethod
+    @lru_cache(maxsize=KEY_CACHE_SIZE)
     def student(student_id: int) -> str:
         return f"student:{student_id}"
     
     @staticmethod
+    @lru_cache(maxsize=KEY_CACHE_SIZE)
     def teacher(teacher_id: int) -> str:
         return f"teacher:{teacher_id}"
     
     @staticmethod
+    @lru_cache(maxsize=KEY_CACHE_SIZE)
     def class_info(class_id: int) -> str:
         return f"class:{class_id}"
     
     @staticmethod
+    @lru_cache(maxsize=KEY_CACHE_SIZE)
     def subject(subject_id: int) -> str:
         return f"subject:{subject_id}"
     
     @staticmethod
+    @lru_cache(maxsize=KEY_CACHE_SIZE)
     def attendance(class_id: int, date: str) -> str:
         return f"attendance:{class_id}:{date}"
     
     @staticmethod
+    @lru_cache(maxsize=KEY_CACHE_SIZE)
     def grades(student_id: int, class_id: int) -> str:
         return f"grades:{student_id}:{class_id}"
     
     @staticmethod
+    @lru_cache(maxsize=KEY_CACHE_SIZE)
     def class_students(class_id: int) -> str:
         return f"class_students:{class_id}"
     
     @staticmethod
+    @lru_cache(maxsize=KEY_CACHE_SIZE)
     def teacher_classes(teacher_id: int) -> str:
         return f"teacher_classes:{teacher_id}"
     
     @staticmethod
+    @lru_cache(maxsize=KEY_CACHE_SIZE)
     def parent_children(parent_id: int) -> str:
         return f"parent_children:{parent_id}"
 
@@ -377,6 +709,12 @@ def warm_class_cache(class_id: int, class_data: Dict[str, Any]):
     if cache:
         cache.set(CacheKeys.class_info(class_id), class_data, ttl=3600)
 
+def warm_bulk(mapping: Dict[str, Any], ttl: int = 3600):
+    """Warm cache with many entries in a single round trip"""
+    cache = get_cache()
+    if cache:
+        cache.mset(mapping, ttl=ttl)
+
 # Cache statistics
 class CacheStats:
     """Cache statistics and monitoring"""
@@ -398,7 +736,9 @@ class CacheStats:
                 "keyspace_hits": info.get("keyspace_hits", 0),
                 "keyspace_misses": info.get("keyspace_misses", 0),
                 "hit_rate": self._calculate_hit_rate(info),
-                "total_keys": len(self.cache_manager.keys()),
+                # From INFO's keyspace section rather than scanning every key;
+                # this counts the whole cache database, not just our prefix
+                "total_keys": info.get(f"db{self.cache_manager.config.db}", {}).get("keys", 0),
                 "uptime_seconds": info.get("uptime_in_seconds", 0)
             }
         except RedisError as e:
@@ -420,7 +760,7 @@ if __name__ == "__main__":
         db=0,
         default_ttl=3600,
         key_prefix="test:",
-        serialize_method="json"
+        serialize_method="msgpack"
     )
     
     # Initialize cache
@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 # from sqlalchemy.dialects.postgresql import UUID  # Not needed for SQLite
@@ -10,26 +11,52 @@ load_dotenv()
 # Database URL from environment variable
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./innovative_school.db")
 
-# Create SQLAlchemy engine
+# Log every SQL statement only when explicitly asked for
+SQL_ECHO = os.getenv("SQL_ECHO", "0") == "1"
+
+def _async_url(url: str) -> str:
+    """Same database as url, reached through its asyncio driver"""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    scheme, rest = url.split("://", 1)
+    return f"postgresql+asyncpg://{rest}" if scheme.startswith("postgres") else url
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers run alongside the writer, and with it NORMAL only
+    # syncs at checkpoints; reads go through a 256MB mmap and a 64MB cache
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
+# Create SQLAlchemy engines; the async engine backs AsyncDatabaseService
 if DATABASE_URL.startswith("sqlite"):
     # SQLite-specific configuration
     engine = create_engine(
         DATABASE_URL,
-        echo=True,  # Set to False in production
+        echo=SQL_ECHO,
         connect_args={"check_same_thread": False}  # SQLite-specific
     )
+    async_engine = create_async_engine(_async_url(DATABASE_URL), echo=SQL_ECHO)
+
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
 else:
     # PostgreSQL configuration
-    engine = create_engine(
-        DATABASE_URL,
-        echo=True,  # Set to False in production
-        pool_pre_ping=True,
-        pool_recycle=300,
-    )
+    pool_options = dict(pool_size=20, max_overflow=10, pool_pre_ping=True, pool_recycle=1800)
+    engine = create_engine(DATABASE_URL, echo=SQL_ECHO, **pool_options)
+    async_engine = create_async_engine(_async_url(DATABASE_URL), echo=SQL_ECHO, **pool_options)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async sessions keep attributes loaded after commit, since an expired
+# attribute cannot be lazily refreshed outside an await
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -41,6 +68,11 @@ def get_db():
     finally:
         db.close()
 
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Test database connection
 def test_connection():
     try:
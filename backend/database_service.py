@@ -1,7 +1,12 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, func, false, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from typing import Optional, List
 from datetime import datetime, date
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pydantic import TypeAdapter
 from database import get_db
 from models import (
     User, Student, Teacher, Parent, Subject, Class, Enrollment, 
@@ -15,7 +20,7 @@ from models import (
     Message, MessageCreate, MessageOut,
     MessageGroup, MessageGroupCreate, MessageGroupOut,
     MessageGroupMember, MessageGroupMemberCreate,
-    Inquiry, InquiryCreate, InquiryUpdate, InquiryOut,
+    Inquiry, InquiryCreate, InquiryUpdate, InquiryOut, TicketCounter,
     InquiryComment, InquiryCommentCreate,
     FinancialTransaction, FinancialTransactionCreate, FinancialTransactionOut,
     InventoryItem, InventoryItemCreate, InventoryItemUpdate, InventoryItemOut,
@@ -25,9 +30,43 @@ from models import (
 )
 from auth import get_password_hash, verify_password
 
+# Rows sent per executemany in the bulk_create_* helpers
+BULK_INSERT_BATCH_SIZE = 5000
+
+@lru_cache(maxsize=None)
+def _list_adapter(out_model) -> TypeAdapter:
+    """Shared list validator for a response model"""
+    return TypeAdapter(List[out_model])
+
+def _validate_many(out_model, rows) -> list:
+    """Convert ORM rows to response models in one pydantic-core call.
+
+    Much cheaper than calling model_validate per row, and reads attributes
+    directly so the Out models need no from_attributes config.
+    """
+    return _list_adapter(out_model).validate_python(list(rows), from_attributes=True)
+
 class DatabaseService:
     def __init__(self, db: Session):
         self.db = db
+        # Lookups memoized for the lifetime of the service, i.e. one request,
+        # keyed by (model, id or email). Misses are not cached so that rows
+        # created later in the request are still found.
+        self._cache: dict = {}
+
+    def _memoized(self, key: tuple, load):
+        """Return the cached lookup for key, calling load() on a miss"""
+        result = self._cache.get(key)
+        if result is None:
+            result = load()
+            if result is not None:
+                self._cache[key] = result
+        return result
+
+    def _forget_user(self, user: User) -> None:
+        """Drop every memoized lookup that refers to a user"""
+        for key in ((User, user.id), (User, user.email), (Student, user.id), (Teacher, user.id), (Parent, user.id)):
+            self._cache.pop(key, None)
 
     # User Management
     def create_user(self, user: UserCreate) -> UserOut:
@@ -46,18 +85,23 @@ class DatabaseService:
 
     def get_user_by_id(self, user_id: int) -> Optional[UserOut]:
         """Get user by ID"""
-        user = self.db.query(User).filter(User.id == user_id).first()
-        return UserOut.model_validate(user) if user else None
+        def load():
+            user = self.db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
+            return UserOut.model_validate(user) if user else None
+        return self._memoized((User, user_id), load)
 
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email (returns full User object for auth)"""
-        return self.db.query(User).filter(User.email == email).first()
+        def load():
+            return self.db.execute(select(User).where(User.email == email)).scalar_one_or_none()
+        return self._memoized((User, email), load)
 
     def update_user(self, user_id: int, user_update: UserUpdate) -> Optional[UserOut]:
         """Update user"""
         user = self.db.query(User).filter(User.id == user_id).first()
         if not user:
             return None
+        self._forget_user(user)
         
         update_data = user_update.model_dump(exclude_unset=True)
         if "password" in update_data:
@@ -66,7 +110,6 @@ class DatabaseService:
         for field, value in update_data.items():
             setattr(user, field, value)
         
-        user.updated_at = datetime.utcnow()
         self.db.commit()
         self.db.refresh(user)
         return UserOut.model_validate(user)
@@ -76,6 +119,7 @@ class DatabaseService:
         user = self.db.query(User).filter(User.id == user_id).first()
         if not user:
             return False
+        self._forget_user(user)
         
         self.db.delete(user)
         self.db.commit()
@@ -84,7 +128,7 @@ class DatabaseService:
     def list_users(self, skip: int = 0, limit: int = 100) -> List[UserOut]:
         """List all users with pagination"""
         users = self.db.query(User).offset(skip).limit(limit).all()
-        return [UserOut.model_validate(user) for user in users]
+        return _validate_many(UserOut, users)
 
     # Student Management
     def create_student(self, student: StudentCreate) -> StudentOut:
@@ -97,18 +141,20 @@ class DatabaseService:
 
     def get_student_by_id(self, student_id: int) -> Optional[StudentOut]:
         """Get student by ID"""
-        student = self.db.query(Student).filter(Student.id == student_id).first()
+        student = self.db.execute(select(Student).where(Student.id == student_id)).scalar_one_or_none()
         return StudentOut.model_validate(student) if student else None
 
     def get_student_by_user_id(self, user_id: int) -> Optional[StudentOut]:
         """Get student by user ID"""
-        student = self.db.query(Student).filter(Student.user_id == user_id).first()
-        return StudentOut.model_validate(student) if student else None
+        def load():
+            student = self.db.execute(select(Student).where(Student.user_id == user_id)).scalar_one_or_none()
+            return StudentOut.model_validate(student) if student else None
+        return self._memoized((Student, user_id), load)
 
     def list_students(self, skip: int = 0, limit: int = 100) -> List[StudentOut]:
         """List all students with pagination"""
-        students = self.db.query(Student).offset(skip).limit(limit).all()
-        return [StudentOut.model_validate(student) for student in students]
+        students = self.db.query(Student).options(raiseload("*")).offset(skip).limit(limit).all()
+        return _validate_many(StudentOut, students)
 
     # Teacher Management
     def create_teacher(self, teacher: TeacherCreate) -> TeacherOut:
@@ -121,18 +167,20 @@ class DatabaseService:
 
     def get_teacher_by_id(self, teacher_id: int) -> Optional[TeacherOut]:
         """Get teacher by ID"""
-        teacher = self.db.query(Teacher).filter(Teacher.id == teacher_id).first()
+        teacher = self.db.execute(select(Teacher).where(Teacher.id == teacher_id)).scalar_one_or_none()
         return TeacherOut.model_validate(teacher) if teacher else None
 
     def get_teacher_by_user_id(self, user_id: int) -> Optional[TeacherOut]:
         """Get teacher by user ID"""
-        teacher = self.db.query(Teacher).filter(Teacher.user_id == user_id).first()
-        return TeacherOut.model_validate(teacher) if teacher else None
+        def load():
+            teacher = self.db.execute(select(Teacher).where(Teacher.user_id == user_id)).scalar_one_or_none()
+            return TeacherOut.model_validate(teacher) if teacher else None
+        return self._memoized((Teacher, user_id), load)
 
     def list_teachers(self, skip: int = 0, limit: int = 100) -> List[TeacherOut]:
         """List all teachers with pagination"""
         teachers = self.db.query(Teacher).offset(skip).limit(limit).all()
-        return [TeacherOut.model_validate(teacher) for teacher in teachers]
+        return _validate_many(TeacherOut, teachers)
 
     # Parent Management
     def create_parent(self, parent: ParentCreate) -> ParentOut:
@@ -145,18 +193,65 @@ class DatabaseService:
 
     def get_parent_by_id(self, parent_id: int) -> Optional[ParentOut]:
         """Get parent by ID"""
-        parent = self.db.query(Parent).filter(Parent.id == parent_id).first()
+        parent = self.db.execute(select(Parent).where(Parent.id == parent_id)).scalar_one_or_none()
         return ParentOut.model_validate(parent) if parent else None
 
     def get_parent_by_user_id(self, user_id: int) -> Optional[ParentOut]:
         """Get parent by user ID"""
-        parent = self.db.query(Parent).filter(Parent.user_id == user_id).first()
-        return ParentOut.model_validate(parent) if parent else None
+        def load():
+            parent = self.db.execute(select(Parent).where(Parent.user_id == user_id)).scalar_one_or_none()
+            return ParentOut.model_validate(parent) if parent else None
+        return self._memoized((Parent, user_id), load)
 
     def list_parents(self, skip: int = 0, limit: int = 100) -> List[ParentOut]:
         """List all parents with pagination"""
         parents = self.db.query(Parent).offset(skip).limit(limit).all()
-        return [ParentOut.model_validate(parent) for parent in parents]
+        return _validate_many(ParentOut, parents)
+
+    def _insert(self, model):
+        """INSERT construct of the session's dialect, which supports ON CONFLICT clauses"""
+        dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+        return dialect.insert(model)
+
+    # Bulk Creation (imports and seeding)
+    def _bulk_insert(self, model, mappings: List[dict], batch_size: int) -> int:
+        """Insert rows in batches without the unit of work, committing once"""
+        try:
+            for start in range(0, len(mappings), batch_size):
+                self.db.bulk_insert_mappings(model, mappings[start:start + batch_size])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return len(mappings)
+
+    def bulk_create_users(self, users: List[UserCreate], batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+        """Create many users in one transaction, returning how many were inserted"""
+        # bcrypt releases the GIL, so hash the passwords on a thread pool
+        with ThreadPoolExecutor() as pool:
+            hashed_passwords = list(pool.map(get_password_hash, [user.password for user in users]))
+        mappings = [
+            {
+                "email": user.email,
+                "hashed_password": hashed_password,
+                "full_name": user.full_name,
+                "role": user.role
+            }
+            for user, hashed_password in zip(users, hashed_passwords)
+        ]
+        return self._bulk_insert(User, mappings, batch_size)
+
+    def bulk_create_students(self, students: List[StudentCreate], batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+        """Create many students in one transaction, returning how many were inserted"""
+        return self._bulk_insert(Student, [student.model_dump() for student in students], batch_size)
+
+    def bulk_create_teachers(self, teachers: List[TeacherCreate], batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+        """Create many teachers in one transaction, returning how many were inserted"""
+        return self._bulk_insert(Teacher, [teacher.model_dump() for teacher in teachers], batch_size)
+
+    def bulk_create_parents(self, parents: List[ParentCreate], batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+        """Create many parents in one transaction, returning how many were inserted"""
+        return self._bulk_insert(Parent, [parent.model_dump() for parent in parents], batch_size)
 
     # Subject Management
     def create_subject(self, name: str, code: str, description: str = None) -> Subject:
@@ -169,7 +264,7 @@ class DatabaseService:
 
     def get_subject_by_id(self, subject_id: int) -> Optional[Subject]:
         """Get subject by ID"""
-        return self.db.query(Subject).filter(Subject.id == subject_id).first()
+        return self.db.execute(select(Subject).where(Subject.id == subject_id)).scalar_one_or_none()
 
     def list_subjects(self, skip: int = 0, limit: int = 100) -> List[Subject]:
         """List all subjects with pagination"""
@@ -191,7 +286,7 @@ class DatabaseService:
 
     def get_class_by_id(self, class_id: int) -> Optional[Class]:
         """Get class by ID"""
-        return self.db.query(Class).filter(Class.id == class_id).first()
+        return self.db.execute(select(Class).where(Class.id == class_id)).scalar_one_or_none()
 
     def list_classes(self, skip: int = 0, limit: int = 100) -> List[Class]:
         """List all classes with pagination"""
@@ -301,17 +396,17 @@ class DatabaseService:
 
     def get_parent_students(self, parent_id: int) -> List[StudentOut]:
         """Get all students linked to a parent"""
-        relationships = self.db.query(ParentStudent).filter(ParentStudent.parent_id == parent_id).all()
-        student_ids = [rel.student_id for rel in relationships]
-        students = self.db.query(Student).filter(Student.id.in_(student_ids)).all()
-        return [StudentOut.model_validate(student) for student in students]
+        students = self.db.query(Student).join(
+            ParentStudent, ParentStudent.student_id == Student.id
+        ).filter(ParentStudent.parent_id == parent_id).options(raiseload("*")).all()
+        return _validate_many(StudentOut, students)
 
     def get_student_parents(self, student_id: int) -> List[ParentOut]:
         """Get all parents linked to a student"""
-        relationships = self.db.query(ParentStudent).filter(ParentStudent.student_id == student_id).all()
-        parent_ids = [rel.parent_id for rel in relationships]
-        parents = self.db.query(Parent).filter(Parent.id.in_(parent_ids)).all()
-        return [ParentOut.model_validate(parent) for parent in parents]
+        parents = self.db.query(Parent).join(
+            ParentStudent, ParentStudent.parent_id == Parent.id
+        ).filter(ParentStudent.student_id == student_id).options(raiseload("*")).all()
+        return _validate_many(ParentOut, parents)
 
     # New methods for Teacher Resource Hub
     def create_resource(self, resource: ResourceCreate, uploaded_by: int) -> ResourceOut:
@@ -334,18 +429,19 @@ class DatabaseService:
 
     def get_resource_by_id(self, resource_id: int) -> Optional[ResourceOut]:
         """Get resource by ID"""
-        resource = self.db.query(Resource).filter(Resource.id == resource_id).first()
+        resource = self.db.execute(select(Resource).where(Resource.id == resource_id)).scalar_one_or_none()
         return ResourceOut.model_validate(resource) if resource else None
 
     def list_resources(self, skip: int = 0, limit: int = 100, subject_id: int = None, grade_level: GradeLevel = None) -> List[ResourceOut]:
         """List all resources with optional filtering"""
-        query = self.db.query(Resource)
+        # ResourceOut only has column fields, so no relationship should load
+        query = self.db.query(Resource).options(raiseload("*"))
         if subject_id:
             query = query.filter(Resource.subject_id == subject_id)
         if grade_level:
             query = query.filter(Resource.grade_level == grade_level)
         resources = query.offset(skip).limit(limit).all()
-        return [ResourceOut.model_validate(resource) for resource in resources]
+        return _validate_many(ResourceOut, resources)
 
     def update_resource(self, resource_id: int, resource_update: ResourceUpdate) -> Optional[ResourceOut]:
         """Update resource"""
@@ -357,7 +453,6 @@ class DatabaseService:
         for field, value in update_data.items():
             setattr(resource, field, value)
         
-        resource.updated_at = datetime.utcnow()
         self.db.commit()
         self.db.refresh(resource)
         return ResourceOut.model_validate(resource)
@@ -374,33 +469,24 @@ class DatabaseService:
 
     def create_resource_rating(self, rating: ResourceRatingCreate, user_id: int) -> ResourceRatingOut:
         """Create a new resource rating"""
-        # Check if user already rated this resource
-        existing_rating = self.db.query(ResourceRating).filter(
-            and_(ResourceRating.resource_id == rating.resource_id, ResourceRating.user_id == user_id)
-        ).first()
-        
-        if existing_rating:
-            # Update existing rating
-            existing_rating.rating = rating.rating
-            self.db.commit()
-            self.db.refresh(existing_rating)
-            return ResourceRatingOut.model_validate(existing_rating)
-        else:
-            # Create new rating
-            db_rating = ResourceRating(
-                resource_id=rating.resource_id,
-                user_id=user_id,
-                rating=rating.rating
-            )
-            self.db.add(db_rating)
-            self.db.commit()
-            self.db.refresh(db_rating)
-            return ResourceRatingOut.model_validate(db_rating)
+        # Insert, or update the user's existing rating of this resource
+        stmt = self._insert(ResourceRating).values(
+            resource_id=rating.resource_id,
+            user_id=user_id,
+            rating=rating.rating
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ResourceRating.resource_id, ResourceRating.user_id],
+            set_={"rating": stmt.excluded.rating}
+        ).returning(ResourceRating).execution_options(populate_existing=True)
+        db_rating = self.db.execute(stmt).scalar_one()
+        self.db.commit()
+        return ResourceRatingOut.model_validate(db_rating, from_attributes=True)
 
     def get_resource_ratings(self, resource_id: int) -> List[ResourceRatingOut]:
         """Get all ratings for a resource"""
         ratings = self.db.query(ResourceRating).filter(ResourceRating.resource_id == resource_id).all()
-        return [ResourceRatingOut.model_validate(rating) for rating in ratings]
+        return _validate_many(ResourceRatingOut, ratings)
 
     def create_resource_comment(self, comment: ResourceCommentCreate, user_id: int) -> ResourceCommentOut:
         """Create a new resource comment"""
@@ -418,7 +504,7 @@ class DatabaseService:
     def get_resource_comments(self, resource_id: int) -> List[ResourceCommentOut]:
         """Get all comments for a resource"""
         comments = self.db.query(ResourceComment).filter(ResourceComment.resource_id == resource_id).all()
-        return [ResourceCommentOut.model_validate(comment) for comment in comments]
+        return _validate_many(ResourceCommentOut, comments)
 
     # New methods for In-App Messaging System
     def create_message(self, message: MessageCreate, sender_id: int) -> MessageOut:
@@ -438,7 +524,7 @@ class DatabaseService:
 
     def get_message_by_id(self, message_id: int) -> Optional[MessageOut]:
         """Get message by ID"""
-        message = self.db.query(Message).filter(Message.id == message_id).first()
+        message = self.db.execute(select(Message).where(Message.id == message_id)).scalar_one_or_none()
         return MessageOut.model_validate(message) if message else None
 
     def get_user_messages(self, user_id: int, skip: int = 0, limit: int = 100) -> List[MessageOut]:
@@ -446,23 +532,32 @@ class DatabaseService:
         messages = self.db.query(Message).filter(
             or_(Message.sender_id == user_id, Message.recipient_id == user_id)
         ).order_by(Message.created_at.desc()).offset(skip).limit(limit).all()
-        return [MessageOut.model_validate(message) for message in messages]
+        return _validate_many(MessageOut, messages)
 
     def get_unread_messages_count(self, user_id: int) -> int:
         """Get count of unread messages for a user"""
-        return self.db.query(Message).filter(
-            and_(Message.recipient_id == user_id, Message.is_read == False)
-        ).count()
+        # Compare against a literal false so the planner can use ix_msgs_unread
+        return self.db.query(func.count(Message.id)).filter(
+            and_(Message.recipient_id == user_id, Message.is_read == false())
+        ).scalar()
 
     def mark_message_as_read(self, message_id: int) -> bool:
         """Mark a message as read"""
-        message = self.db.query(Message).filter(Message.id == message_id).first()
-        if not message:
-            return False
-        
-        message.is_read = True
+        updated = self.db.query(Message).filter(Message.id == message_id).update(
+            {"is_read": True}, synchronize_session=False
+        )
         self.db.commit()
-        return True
+        return updated > 0
+
+    def mark_messages_as_read(self, message_ids: List[int], recipient_id: int) -> int:
+        """Mark a recipient's messages as read in one UPDATE, returning how many matched"""
+        if not message_ids:
+            return 0
+        updated = self.db.query(Message).filter(
+            and_(Message.id.in_(message_ids), Message.recipient_id == recipient_id)
+        ).update({"is_read": True}, synchronize_session=False)
+        self.db.commit()
+        return updated
 
     def create_message_group(self, group: MessageGroupCreate, created_by: int) -> MessageGroupOut:
         """Create a new message group"""
@@ -479,7 +574,7 @@ class DatabaseService:
 
     def get_message_group_by_id(self, group_id: int) -> Optional[MessageGroupOut]:
         """Get message group by ID"""
-        group = self.db.query(MessageGroup).filter(MessageGroup.id == group_id).first()
+        group = self.db.execute(select(MessageGroup).where(MessageGroup.id == group_id)).scalar_one_or_none()
         return MessageGroupOut.model_validate(group) if group else None
 
     def get_user_message_groups(self, user_id: int) -> List[MessageGroupOut]:
@@ -487,27 +582,17 @@ class DatabaseService:
         groups = self.db.query(MessageGroup).join(MessageGroupMember).filter(
             MessageGroupMember.user_id == user_id
         ).all()
-        return [MessageGroupOut.model_validate(group) for group in groups]
+        return _validate_many(MessageGroupOut, groups)
 
     def add_user_to_group(self, group_member: MessageGroupMemberCreate) -> bool:
         """Add a user to a message group"""
-        # Check if user is already in the group
-        existing_member = self.db.query(MessageGroupMember).filter(
-            and_(
-                MessageGroupMember.group_id == group_member.group_id,
-                MessageGroupMember.user_id == group_member.user_id
-            )
-        ).first()
-        
-        if existing_member:
-            return True  # Already a member
-        
-        db_member = MessageGroupMember(
+        # Users already in the group are left as they are
+        stmt = self._insert(MessageGroupMember).values(
             group_id=group_member.group_id,
             user_id=group_member.user_id,
             role=group_member.role
-        )
-        self.db.add(db_member)
+        ).on_conflict_do_nothing(index_elements=[MessageGroupMember.group_id, MessageGroupMember.user_id])
+        self.db.execute(stmt)
         self.db.commit()
         return True
 
@@ -515,7 +600,8 @@ class DatabaseService:
     def create_inquiry(self, inquiry: InquiryCreate) -> InquiryOut:
         """Create a new inquiry"""
         # Generate ticket number
-        ticket_number = f"INQ-{datetime.now().strftime('%Y%m%d')}-{self.db.query(Inquiry).count() + 1:04d}"
+        today = datetime.now().date()
+        ticket_number = f"INQ-{today.strftime('%Y%m%d')}-{self._next_ticket_counter(today):04d}"
         
         db_inquiry = Inquiry(
             ticket_number=ticket_number,
@@ -529,27 +615,52 @@ class DatabaseService:
         self.db.add(db_inquiry)
         self.db.commit()
         self.db.refresh(db_inquiry)
-        return InquiryOut.model_validate(db_inquiry)
+        return InquiryOut.model_validate(db_inquiry, from_attributes=True)
+
+    def _next_ticket_counter(self, day: date) -> int:
+        """Atomically bump and return the inquiry ticket counter for a day"""
+        counter = self.db.execute(
+            update(TicketCounter)
+            .where(TicketCounter.day == day)
+            .values(counter=TicketCounter.counter + 1)
+            .returning(TicketCounter.counter)
+        ).scalar_one_or_none()
+        if counter is not None:
+            return counter
+        
+        # First ticket of the day: continue after any tickets already issued
+        # for it before the counter row existed, e.g. on the day of deployment
+        prefix = f"INQ-{day.strftime('%Y%m%d')}-"
+        issued = self.db.execute(
+            select(Inquiry.ticket_number).where(Inquiry.ticket_number.like(f"{prefix}%"))
+        ).scalars()
+        seed = max((int(t[len(prefix):]) for t in issued if t[len(prefix):].isdigit()), default=0)
+        stmt = self._insert(TicketCounter).values(day=day, counter=seed + 1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TicketCounter.day],
+            set_={"counter": TicketCounter.counter + 1}
+        ).returning(TicketCounter.counter)
+        return self.db.execute(stmt).scalar_one()
 
     def get_inquiry_by_id(self, inquiry_id: int) -> Optional[InquiryOut]:
         """Get inquiry by ID"""
-        inquiry = self.db.query(Inquiry).filter(Inquiry.id == inquiry_id).first()
+        inquiry = self.db.execute(select(Inquiry).where(Inquiry.id == inquiry_id)).scalar_one_or_none()
         return InquiryOut.model_validate(inquiry) if inquiry else None
 
     def get_inquiry_by_ticket_number(self, ticket_number: str) -> Optional[InquiryOut]:
         """Get inquiry by ticket number"""
-        inquiry = self.db.query(Inquiry).filter(Inquiry.ticket_number == ticket_number).first()
+        inquiry = self.db.execute(select(Inquiry).where(Inquiry.ticket_number == ticket_number)).scalar_one_or_none()
         return InquiryOut.model_validate(inquiry) if inquiry else None
 
     def list_inquiries(self, skip: int = 0, limit: int = 100, status: InquiryStatus = None, department: InquiryDepartment = None) -> List[InquiryOut]:
         """List all inquiries with optional filtering"""
-        query = self.db.query(Inquiry)
+        query = self.db.query(Inquiry).options(raiseload("*"))
         if status:
             query = query.filter(Inquiry.status == status)
         if department:
             query = query.filter(Inquiry.department == department)
         inquiries = query.order_by(Inquiry.created_at.desc()).offset(skip).limit(limit).all()
-        return [InquiryOut.model_validate(inquiry) for inquiry in inquiries]
+        return _validate_many(InquiryOut, inquiries)
 
     def update_inquiry(self, inquiry_id: int, inquiry_update: InquiryUpdate) -> Optional[InquiryOut]:
         """Update inquiry"""
@@ -562,9 +673,8 @@ class DatabaseService:
             setattr(inquiry, field, value)
         
         if inquiry.status == InquiryStatus.resolved and inquiry.resolved_at is None:
-            inquiry.resolved_at = datetime.utcnow()
+            inquiry.resolved_at = func.now()
         
-        inquiry.updated_at = datetime.utcnow()
         self.db.commit()
         self.db.refresh(inquiry)
         return InquiryOut.model_validate(inquiry)
@@ -607,41 +717,39 @@ class DatabaseService:
         if transaction_type:
             query = query.filter(FinancialTransaction.transaction_type == transaction_type)
         transactions = query.order_by(FinancialTransaction.created_at.desc()).offset(skip).limit(limit).all()
-        return [FinancialTransactionOut.model_validate(transaction) for transaction in transactions]
+        return _validate_many(FinancialTransactionOut, transactions)
 
-    def get_weekly_financial_report(self, start_date: date, end_date: date) -> dict:
-        """Generate weekly financial report"""
-        # Get income transactions
-        income_transactions = self.db.query(FinancialTransaction).filter(
-            and_(
-                FinancialTransaction.transaction_type == FinancialTransactionType.income,
-                FinancialTransaction.created_at >= start_date,
-                FinancialTransaction.created_at <= end_date
-            )
-        ).all()
-        
-        # Get expense transactions
-        expense_transactions = self.db.query(FinancialTransaction).filter(
-            and_(
-                FinancialTransaction.transaction_type == FinancialTransactionType.expense,
-                FinancialTransaction.created_at >= start_date,
-                FinancialTransaction.created_at <= end_date
-            )
-        ).all()
+    def get_weekly_financial_report(self, start_date: date, end_date: date, include_details: bool = False) -> dict:
+        """Generate weekly financial report, listing the transactions only if include_details is set"""
+        in_period = and_(
+            FinancialTransaction.created_at >= start_date,
+            FinancialTransaction.created_at <= end_date
+        )
         
-        # Calculate totals
-        total_income = sum(t.amount for t in income_transactions)
-        total_expenses = sum(t.amount for t in expense_transactions)
+        # Calculate totals in the database
+        totals = dict(
+            self.db.query(FinancialTransaction.transaction_type, func.sum(FinancialTransaction.amount))
+            .filter(in_period).group_by(FinancialTransaction.transaction_type).all()
+        )
+        total_income = totals.get(FinancialTransactionType.income, 0.0)
+        total_expenses = totals.get(FinancialTransactionType.expense, 0.0)
         net_balance = total_income - total_expenses
         
-        return {
+        report = {
             "period": f"{start_date} to {end_date}",
             "total_income": total_income,
             "total_expenses": total_expenses,
-            "net_balance": net_balance,
-            "income_transactions": [FinancialTransactionOut.model_validate(t) for t in income_transactions],
-            "expense_transactions": [FinancialTransactionOut.model_validate(t) for t in expense_transactions]
+            "net_balance": net_balance
         }
+        if include_details:
+            transactions = self.db.query(FinancialTransaction).filter(in_period).all()
+            report["income_transactions"] = _validate_many(FinancialTransactionOut, (
+                t for t in transactions if t.transaction_type == FinancialTransactionType.income
+            ))
+            report["expense_transactions"] = _validate_many(FinancialTransactionOut, (
+                t for t in transactions if t.transaction_type == FinancialTransactionType.expense
+            ))
+        return report
 
     def create_inventory_item(self, item: InventoryItemCreate) -> InventoryItemOut:
         """Create a new inventory item"""
@@ -661,9 +769,18 @@ class DatabaseService:
         self.db.refresh(db_item)
         return InventoryItemOut.model_validate(db_item)
 
+    def bulk_create_inventory_items(self, items: List[InventoryItemCreate], batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+        """Create many inventory items in one transaction, returning how many were inserted"""
+        mappings = []
+        for item in items:
+            mapping = item.model_dump()
+            mapping["total_value"] = (item.quantity or 0) * (item.unit_price or 0.0)
+            mappings.append(mapping)
+        return self._bulk_insert(InventoryItem, mappings, batch_size)
+
     def get_inventory_item_by_id(self, item_id: int) -> Optional[InventoryItemOut]:
         """Get inventory item by ID"""
-        item = self.db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
+        item = self.db.execute(select(InventoryItem).where(InventoryItem.id == item_id)).scalar_one_or_none()
         return InventoryItemOut.model_validate(item) if item else None
 
     def list_inventory_items(self, skip: int = 0, limit: int = 100, category: str = None, status: str = None) -> List[InventoryItemOut]:
@@ -674,7 +791,7 @@ class DatabaseService:
         if status:
             query = query.filter(InventoryItem.status == status)
         items = query.offset(skip).limit(limit).all()
-        return [InventoryItemOut.model_validate(item) for item in items]
+        return _validate_many(InventoryItemOut, items)
 
     def update_inventory_item(self, item_id: int, item_update: InventoryItemUpdate) -> Optional[InventoryItemOut]:
         """Update inventory item"""
@@ -690,7 +807,6 @@ class DatabaseService:
         if 'quantity' in update_data or 'unit_price' in update_data:
             item.total_value = item.quantity * item.unit_price
         
-        item.updated_at = datetime.utcnow()
         self.db.commit()
         self.db.refresh(item)
         return InventoryItemOut.model_validate(item)
@@ -725,7 +841,7 @@ class DatabaseService:
         if item_id:
             query = query.filter(InventoryLog.item_id == item_id)
         logs = query.order_by(InventoryLog.created_at.desc()).offset(skip).limit(limit).all()
-        return [InventoryLogOut.model_validate(log) for log in logs]
+        return _validate_many(InventoryLogOut, logs)
 
     def get_weekly_activity_report(self, start_date: date, end_date: date) -> dict:
         """Generate weekly activity report"""
@@ -790,9 +906,130 @@ class DatabaseService:
             "checked_out_items": len(checked_out_items),
             "maintenance_items": len(maintenance_items),
             "retired_items": len(retired_items),
-            "low_stock_items": [InventoryItemOut.model_validate(item) for item in low_stock_items]
+            "low_stock_items": _validate_many(InventoryItemOut, low_stock_items)
         }
 
+class AsyncDatabaseService:
+    """AsyncSession counterpart of DatabaseService for the hot read paths.
+
+    Awaiting the database lets the event loop serve other requests while a
+    query is in flight. Methods mirror their DatabaseService namesakes; the
+    sync service remains the one used by scripts and migrations.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        # Per-request lookup memo, as in DatabaseService
+        self._cache: dict = {}
+
+    async def _memoized(self, key: tuple, load):
+        """Return the cached lookup for key, awaiting load() on a miss"""
+        result = self._cache.get(key)
+        if result is None:
+            result = await load()
+            if result is not None:
+                self._cache[key] = result
+        return result
+
+    async def _scalar(self, stmt):
+        """Run a single-row lookup and return the ORM object or None"""
+        return (await self.db.execute(stmt)).scalar_one_or_none()
+
+    async def _all(self, stmt) -> list:
+        """Run a query and return every ORM object it selects"""
+        return (await self.db.execute(stmt)).scalars().all()
+
+    # User Management
+    async def get_user_by_id(self, user_id: int) -> Optional[UserOut]:
+        """Get user by ID"""
+        async def load():
+            user = await self._scalar(select(User).where(User.id == user_id))
+            return UserOut.model_validate(user, from_attributes=True) if user else None
+        return await self._memoized((User, user_id), load)
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        """Get user by email (returns full User object for auth)"""
+        return await self._memoized((User, email), lambda: self._scalar(select(User).where(User.email == email)))
+
+    async def list_users(self, skip: int = 0, limit: int = 100) -> List[UserOut]:
+        """List all users with pagination"""
+        users = await self._all(select(User).offset(skip).limit(limit))
+        return _validate_many(UserOut, users)
+
+    # Profiles
+    async def get_student_by_user_id(self, user_id: int) -> Optional[StudentOut]:
+        """Get student by user ID"""
+        async def load():
+            student = await self._scalar(select(Student).where(Student.user_id == user_id))
+            return StudentOut.model_validate(student, from_attributes=True) if student else None
+        return await self._memoized((Student, user_id), load)
+
+    async def get_teacher_by_user_id(self, user_id: int) -> Optional[TeacherOut]:
+        """Get teacher by user ID"""
+        async def load():
+            teacher = await self._scalar(select(Teacher).where(Teacher.user_id == user_id))
+            return TeacherOut.model_validate(teacher, from_attributes=True) if teacher else None
+        return await self._memoized((Teacher, user_id), load)
+
+    async def get_parent_by_user_id(self, user_id: int) -> Optional[ParentOut]:
+        """Get parent by user ID"""
+        async def load():
+            parent = await self._scalar(select(Parent).where(Parent.user_id == user_id))
+            return ParentOut.model_validate(parent, from_attributes=True) if parent else None
+        return await self._memoized((Parent, user_id), load)
+
+    async def list_students(self, skip: int = 0, limit: int = 100) -> List[StudentOut]:
+        """List all students with pagination"""
+        students = await self._all(select(Student).options(raiseload("*")).offset(skip).limit(limit))
+        return _validate_many(StudentOut, students)
+
+    # Resources
+    async def get_resource_by_id(self, resource_id: int) -> Optional[ResourceOut]:
+        """Get resource by ID"""
+        resource = await self._scalar(select(Resource).where(Resource.id == resource_id))
+        return ResourceOut.model_validate(resource, from_attributes=True) if resource else None
+
+    async def list_resources(self, skip: int = 0, limit: int = 100, subject_id: int = None, grade_level: GradeLevel = None) -> List[ResourceOut]:
+        """List all resources with optional filtering"""
+        stmt = select(Resource).options(raiseload("*"))
+        if subject_id:
+            stmt = stmt.where(Resource.subject_id == subject_id)
+        if grade_level:
+            stmt = stmt.where(Resource.grade_level == grade_level)
+        resources = await self._all(stmt.offset(skip).limit(limit))
+        return _validate_many(ResourceOut, resources)
+
+    # Messaging
+    async def get_user_messages(self, user_id: int, skip: int = 0, limit: int = 100) -> List[MessageOut]:
+        """Get all messages for a user (sent and received)"""
+        messages = await self._all(
+            select(Message).where(
+                or_(Message.sender_id == user_id, Message.recipient_id == user_id)
+            ).order_by(Message.created_at.desc()).offset(skip).limit(limit)
+        )
+        return _validate_many(MessageOut, messages)
+
+    async def get_unread_messages_count(self, user_id: int) -> int:
+        """Get count of unread messages for a user"""
+        result = await self.db.execute(
+            select(func.count(Message.id)).where(
+                and_(Message.recipient_id == user_id, Message.is_read == false())
+            )
+        )
+        return result.scalar_one()
+
+    async def mark_messages_as_read(self, message_ids: List[int], recipient_id: int) -> int:
+        """Mark a recipient's messages as read in one UPDATE, returning how many matched"""
+        if not message_ids:
+            return 0
+        result = await self.db.execute(
+            update(Message).where(
+                and_(Message.id.in_(message_ids), Message.recipient_id == recipient_id)
+            ).values(is_read=True).execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
+
 # Helper function to get database service
 def get_database_service(db: Session = None) -> DatabaseService:
     """Get database service instance"""
@@ -18,7 +18,7 @@ from routes_resources import router as resources_router
 from routes_messaging import router as messaging_router
 from routes_inquiries import router as inquiries_router
 from routes_accounting import router as accounting_router
-from database import engine, Base, test_connection
+from database import engine, async_engine, Base, test_connection
 
 # Optional imports for Redis
 try:
@@ -53,7 +53,8 @@ async def lifespan(app: FastAPI):
                 host=redis_host,
                 port=redis_port,
                 db=1,  # Use different DB for cache
-                default_ttl=3600
+                default_ttl=3600,
+                max_connections=int(os.getenv("REDIS_POOL_SIZE", "50"))
             )
             init_cache(cache_config)
             print("✅ Cache system initialized")
@@ -67,6 +68,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("🛑 Shutting down Innovative School Platform API...")
+    await async_engine.dispose()
 
 app = FastAPI(
     title="Innovative School Platform API",
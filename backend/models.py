@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import Optional, List
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, DateTime, Date, Boolean, Text, ForeignKey, Table, Float, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, Date, Boolean, Text, ForeignKey, Table, Float, Index, false, func, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from geoalchemy2 import Geometry
@@ -53,7 +53,7 @@ class User(Base):
     role = Column(SQLEnum(UserRole), nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     student_profile = relationship("Student", back_populates="user", uselist=False)
@@ -75,7 +75,7 @@ class Student(Base):
     enrollment_date = Column(Date, default=date.today)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     user = relationship("User", back_populates="student_profile")
@@ -100,7 +100,7 @@ class Teacher(Base):
     hire_date = Column(Date, default=date.today)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     user = relationship("User", back_populates="teacher_profile")
@@ -117,7 +117,7 @@ class Parent(Base):
     address = Column(Text)
     occupation = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     user = relationship("User", back_populates="parent_profile")
@@ -132,7 +132,7 @@ class Subject(Base):
     description = Column(Text)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     class_assignments = relationship("ClassAssignment", back_populates="subject")
@@ -148,7 +148,7 @@ class Class(Base):
     capacity = Column(Integer, default=30)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     enrollments = relationship("Enrollment", back_populates="class_")
@@ -260,7 +260,7 @@ class Resource(Base):
     uploaded_by = Column(Integer, ForeignKey("teachers.id"))
     is_public = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     subject = relationship("Subject")
@@ -280,6 +280,11 @@ class ResourceRating(Base):
     # Relationships
     resource = relationship("Resource", back_populates="ratings")
     user = relationship("User")
+    
+    # One rating per user and resource, the conflict target of the rating upsert
+    __table_args__ = (
+        Index("uq_resource_rating_user", "resource_id", "user_id", unique=True),
+    )
 
 class ResourceComment(Base):
     __tablename__ = "resource_comments"
@@ -290,7 +295,7 @@ class ResourceComment(Base):
     comment = Column(Text, nullable=False)
     parent_comment_id = Column(Integer, ForeignKey("resource_comments.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     resource = relationship("Resource", back_populates="comments")
@@ -320,6 +325,15 @@ class Message(Base):
     sender = relationship("User", foreign_keys=[sender_id])
     recipient = relationship("User", foreign_keys=[recipient_id])
     group = relationship("MessageGroup", back_populates="messages")
+    
+    # Partial index covering only unread messages, for the unread badge count
+    __table_args__ = (
+        Index(
+            "ix_msgs_unread", "recipient_id",
+            postgresql_where=is_read == false(),
+            sqlite_where=is_read == false()
+        ),
+    )
 
 class MessageGroup(Base):
     __tablename__ = "message_groups"
@@ -347,6 +361,11 @@ class MessageGroupMember(Base):
     # Relationships
     group = relationship("MessageGroup", back_populates="members")
     user = relationship("User")
+    
+    # One membership per user and group, the conflict target of add_user_to_group
+    __table_args__ = (
+        Index("uq_message_group_member", "group_id", "user_id", unique=True),
+    )
 
 # New models for School Inquiry Management System
 class InquiryStatus(str, Enum):
@@ -376,13 +395,20 @@ class Inquiry(Base):
     priority = Column(String, default="medium")  # low, medium, high, urgent
     assigned_to = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
     resolved_at = Column(DateTime, nullable=True)
     
     # Relationships
     assignee = relationship("User")
     comments = relationship("InquiryComment", back_populates="inquiry")
 
+class TicketCounter(Base):
+    __tablename__ = "ticket_counters"
+    
+    # One row per day, bumped atomically to number that day's inquiry tickets
+    day = Column(Date, primary_key=True)
+    counter = Column(Integer, nullable=False, default=0)
+
 class InquiryComment(Base):
     __tablename__ = "inquiry_comments"
     
@@ -416,6 +442,11 @@ class FinancialTransaction(Base):
     
     # Relationships
     creator = relationship("User")
+    
+    # Serves the per-type date range sums in the financial reports
+    __table_args__ = (
+        Index("ix_fin_tx_type_created", "transaction_type", "created_at"),
+    )
 
 class InventoryItem(Base):
     __tablename__ = "inventory_items"
@@ -430,7 +461,7 @@ class InventoryItem(Base):
     location = Column(String)
     status = Column(String, default="available")  # available, checked_out, maintenance, retired
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
 
 class InventoryLog(Base):
     __tablename__ = "inventory_logs"
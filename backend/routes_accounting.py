@@ -240,6 +240,7 @@ async def get_weekly_activity_report(
 
 @router.get("/reports/weekly-financial")
 async def get_weekly_financial_report(
+    include_details: bool = False,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
 ):
@@ -256,7 +257,7 @@ async def get_weekly_financial_report(
     end_date = date.today()
     start_date = end_date - timedelta(days=7)
     
-    report = db_service.get_weekly_financial_report(start_date, end_date)
+    report = db_service.get_weekly_financial_report(start_date, end_date, include_details)
     return report
 
 @router.get("/reports/weekly-inventory")
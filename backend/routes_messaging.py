@@ -1,17 +1,18 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Query
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import date
 
-from database import get_db
-from database_service import DatabaseService
+from database import get_db, get_async_db
+from database_service import DatabaseService, AsyncDatabaseService
 from models import (
     MessageCreate, MessageOut,
     MessageGroupCreate, MessageGroupOut,
     MessageGroupMemberCreate,
     UserRole
 )
-from auth import get_current_user, get_current_active_user
+from auth import get_current_user, get_current_active_user, get_current_active_user_async
 from rbac import require_permission, Permission
 
 router = APIRouter(prefix="/api/messages", tags=["messaging"])
@@ -46,22 +47,22 @@ async def send_message(
 async def get_user_messages(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_active_user_async)
 ):
     """Get all messages for the current user"""
-    db_service = DatabaseService(db)
-    messages = db_service.get_user_messages(current_user.id, skip=skip, limit=limit)
+    db_service = AsyncDatabaseService(db)
+    messages = await db_service.get_user_messages(current_user.id, skip=skip, limit=limit)
     return messages
 
 @router.get("/unread-count", response_model=dict)
 async def get_unread_messages_count(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_active_user_async)
 ):
     """Get count of unread messages for the current user"""
-    db_service = DatabaseService(db)
-    count = db_service.get_unread_messages_count(current_user.id)
+    db_service = AsyncDatabaseService(db)
+    count = await db_service.get_unread_messages_count(current_user.id)
     return {"unread_count": count}
 
 @router.get("/{message_id}", response_model=MessageOut)
@@ -132,6 +133,18 @@ async def mark_message_as_read(
     
     return {"message": "Message marked as read"}
 
+@router.post("/read")
+async def mark_messages_as_read(
+    message_ids: List[int],
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_active_user_async)
+):
+    """Mark several of the current user's messages as read"""
+    db_service = AsyncDatabaseService(db)
+    # Only messages addressed to the current user are updated
+    updated = await db_service.mark_messages_as_read(message_ids, current_user.id)
+    return {"message": f"{updated} messages marked as read"}
+
 # Group messaging endpoints
 @router.post("/groups", response_model=MessageGroupOut, status_code=status.HTTP_201_CREATED)
 async def create_message_group(
@@ -142,7 +142,6 @@ def update_subject(
     subject.name = subject_update.name
     subject.code = subject_update.code
     subject.description = subject_update.description
-    subject.updated_at = datetime.utcnow()
     
     db_service.db.commit()
     db_service.db.refresh(subject)
@@ -186,7 +185,6 @@ def deactivate_subject(
     
     # Deactivate subject
     subject.is_active = False
-    subject.updated_at = datetime.utcnow()
     
     db_service.db.commit()
     
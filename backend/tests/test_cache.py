@@ -0,0 +1,113 @@
+"""
+Tests for the Redis cache manager's local cache
+"""
+import asyncio
+import time
+
+import pytest
+
+from cache import CacheConfig, CacheManager, _MISS
+
+
+class ExpiringRedis:
+    """In-memory stand-in for the few Redis commands the read paths send"""
+
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key: bytes, value: bytes, px: int):
+        self.data[key] = (value, time.monotonic() + px / 1000)
+
+    def _live(self, key: bytes):
+        entry = self.data.get(key)
+        if entry is not None and time.monotonic() >= entry[1]:
+            del self.data[key]
+            return None
+        return entry
+
+    def get(self, key: bytes):
+        entry = self._live(key)
+        return None if entry is None else entry[0]
+
+    def pttl(self, key: bytes) -> int:
+        entry = self._live(key)
+        return -2 if entry is None else int((entry[1] - time.monotonic()) * 1000)
+
+    def pipeline(self, transaction: bool = True):
+        return ExpiringPipeline(self)
+
+
+class ExpiringPipeline:
+    def __init__(self, redis: ExpiringRedis):
+        self.redis = redis
+        self.commands = []
+
+    def get(self, key):
+        self.commands.append((self.redis.get, key))
+        return self
+
+    def pttl(self, key):
+        self.commands.append((self.redis.pttl, key))
+        return self
+
+    def execute(self):
+        return [command(key) for command, key in self.commands]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class AsyncExpiringPipeline(ExpiringPipeline):
+    async def execute(self):
+        return super().execute()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+class AsyncExpiringRedis:
+    def __init__(self, redis: ExpiringRedis):
+        self.redis = redis
+
+    def pipeline(self, transaction: bool = True):
+        return AsyncExpiringPipeline(self.redis)
+
+
+@pytest.fixture
+def cache_manager():
+    """A cache manager using the local cache in front of an in-memory Redis."""
+    # Nothing listens on port 1, so the manager starts without a client
+    manager = CacheManager(CacheConfig(port=1, key_prefix="test:", serialize_method="json"))
+    redis = ExpiringRedis()
+    manager.redis_client = redis
+    manager.async_client = AsyncExpiringRedis(redis)
+    return manager
+
+
+def test_local_cache_expires_with_redis_key(cache_manager):
+    """Test that a value read shortly before its Redis expiry is not served after it."""
+    cache_manager.redis_client.set(cache_manager._get_key("short"), cache_manager._serialize(1), px=200)
+
+    assert cache_manager.get_or_miss("short") == 1
+    time.sleep(0.3)
+    assert cache_manager.get_or_miss("short") is _MISS
+
+
+def test_async_local_cache_expires_with_redis_key(cache_manager):
+    """Test the same bound on the asyncio read path."""
+    cache_manager.redis_client.set(cache_manager._get_key("short"), cache_manager._serialize(1), px=200)
+
+    async def read_twice():
+        first = await cache_manager.aget_or_miss("short")
+        await asyncio.sleep(0.3)
+        return first, await cache_manager.aget_or_miss("short")
+
+    first, second = asyncio.run(read_twice())
+    assert first == 1
+    assert second is _MISS
@@ -0,0 +1,78 @@
+"""
+Tests for the DatabaseService upserts
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy.orm import Session
+
+from database_service import DatabaseService
+from models import (
+    Inquiry, InquiryCreate, InquiryDepartment, MessageGroup, MessageGroupMember, MessageGroupMemberCreate,
+    Resource, ResourceRating, ResourceRatingCreate, User
+)
+
+
+@pytest.fixture
+def user(db_session: Session):
+    """Create a user; the services under test never check its password."""
+    user = User(email="member@example.com", hashed_password="x", full_name="Member", role="teacher")
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+def test_create_resource_rating_inserts_then_updates(db_session: Session, user):
+    """Test that rating a resource twice updates the user's single rating."""
+    resource = Resource(title="Algebra notes")
+    db_session.add(resource)
+    db_session.commit()
+    service = DatabaseService(db_session)
+
+    first = service.create_resource_rating(
+        ResourceRatingCreate(resource_id=resource.id, rating=2), user.id
+    )
+    assert first.rating == 2
+
+    second = service.create_resource_rating(
+        ResourceRatingCreate(resource_id=resource.id, rating=5), user.id
+    )
+    assert second.id == first.id
+    assert second.rating == 5
+
+    ratings = db_session.query(ResourceRating).filter(ResourceRating.resource_id == resource.id).all()
+    assert [r.rating for r in ratings] == [5]
+
+
+def test_add_user_to_group_is_idempotent(db_session: Session, user):
+    """Test that adding a member twice keeps one membership with its first role."""
+    group = MessageGroup(name="Staff", created_by=user.id)
+    db_session.add(group)
+    db_session.commit()
+    service = DatabaseService(db_session)
+
+    member = MessageGroupMemberCreate(group_id=group.id, user_id=user.id, role="admin")
+    assert service.add_user_to_group(member) is True
+    member.role = "member"
+    assert service.add_user_to_group(member) is True
+
+    members = db_session.query(MessageGroupMember).filter(MessageGroupMember.group_id == group.id).all()
+    assert [m.role for m in members] == ["admin"]
+
+
+def test_ticket_numbers_continue_after_existing_tickets(db_session: Session):
+    """Test that the first counted ticket of a day follows tickets issued before the counter."""
+    prefix = f"INQ-{datetime.now().strftime('%Y%m%d')}-"
+    db_session.add(Inquiry(
+        ticket_number=f"{prefix}0057", name="Parent", email="parent@example.com",
+        subject="Fees", message="When are fees due?", department=InquiryDepartment.finance
+    ))
+    db_session.commit()
+    service = DatabaseService(db_session)
+
+    inquiry = InquiryCreate(
+        name="Parent", email="parent@example.com", subject="Fees",
+        message="Is there a discount for siblings?", department=InquiryDepartment.finance
+    )
+    assert service.create_inquiry(inquiry).ticket_number == f"{prefix}0058"
+    assert service.create_inquiry(inquiry).ticket_number == f"{prefix}0059"
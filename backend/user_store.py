@@ -1,6 +1,6 @@
 from typing import Dict, Optional
-from .models import UserCreate, UserUpdate, UserOut
-from .auth import get_password_hash
+from models import UserCreate, UserUpdate, UserOut
+from auth import get_password_hash
 
 class UserStore:
     def __init__(self):